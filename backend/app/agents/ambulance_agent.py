@@ -30,7 +30,17 @@ class AmbulanceAgent(BaseAgent):
         available: bool = True,
     ):
         super().__init__(agent_id, AGENT_TYPE_AMBULANCE, agent_id.upper())
-        
+        self.reset_fields(location, capacity, fuel, available)
+    
+    def reset_fields(
+        self,
+        location: Tuple[float, float],
+        capacity: int = AMBULANCE_CAPACITY,
+        fuel: float = 1.0,
+        available: bool = True,
+    ):
+        """(Re)initialize ambulance state in place so the agent can be reused across runs"""
+        self._reset_base()
         self.location = location
         self.capacity = capacity
         self.current_patients: List[Dict] = []
@@ -85,7 +95,7 @@ class AmbulanceAgent(BaseAgent):
             "patients_delivered": self.patients_delivered,
         }
     
-    def generate_message(self) -> Dict[str, Any]:
+    async def generate_message(self) -> Dict[str, Any]:
         """Generate status message for negotiation"""
         message = self.get_base_message()
         message.update({
@@ -147,6 +157,7 @@ class AmbulanceAgent(BaseAgent):
         
         old_hospital = self.target_hospital
         self.target_hospital = new_hospital
+        self.is_dirty = True
         self.destination = new_location
         self._calculate_eta()
         
@@ -162,6 +173,7 @@ class AmbulanceAgent(BaseAgent):
         self.target_hospital = hospital_id
         self.status = "en_route_pickup"
         self.destination = patient.get("location")
+        self.is_dirty = True
         self._calculate_eta()
         
         self.log_action("mission_assigned", {
@@ -198,6 +210,10 @@ class AmbulanceAgent(BaseAgent):
         """Update ambulance state for a simulation tick"""
         actions = []
         
+        # Idle ambulances neither move nor burn fuel
+        if self.status != "idle":
+            self.is_dirty = True
+        
         if self.status == "en_route_pickup" and self.destination:
             # Move toward patient
             arrived = self._move_toward(self.destination)
@@ -22,6 +22,8 @@ class BaseAgent(ABC):
         self.last_updated = datetime.now()
         self._message_queue: List[Dict[str, Any]] = []
         self._action_log: List[Dict[str, Any]] = []
+        # Set whenever get_state() output may have changed; cleared by the simulator once read
+        self.is_dirty: bool = True
     
     @abstractmethod
     def get_state(self) -> Dict[str, Any]:
@@ -29,7 +31,7 @@ class BaseAgent(ABC):
         pass
     
     @abstractmethod
-    def generate_message(self) -> Dict[str, Any]:
+    async def generate_message(self) -> Dict[str, Any]:
         """
         Generate a message to broadcast to other agents.
         Message format:
@@ -63,6 +65,13 @@ class BaseAgent(ABC):
         """Calculate this agent's priority score for negotiation"""
         pass
     
+    def _reset_base(self) -> None:
+        """Clear per-run bookkeeping so a pooled agent can be reused in place"""
+        self.last_updated = datetime.now()
+        self._message_queue.clear()
+        self._action_log.clear()
+        self.is_dirty = True
+    
     def log_action(self, action_type: str, details: Dict[str, Any]) -> None:
         """Log an action for timeline replay"""
         self._action_log.append({
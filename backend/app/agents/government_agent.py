@@ -25,7 +25,11 @@ class GovernmentAgent(BaseAgent):
         fairness_weight: float = 0.7,
     ):
         super().__init__(agent_id, AGENT_TYPE_GOVERNMENT, "Government Authority")
-        
+        self.reset_fields(disaster_severity, fairness_weight)
+    
+    def reset_fields(self, disaster_severity: float = 0.5, fairness_weight: float = 0.7):
+        """(Re)initialize policies in place so the agent can be reused across runs"""
+        self._reset_base()
         self.disaster_severity = disaster_severity  # 0.0 to 1.0
         
         # Priority rules
@@ -78,7 +82,7 @@ class GovernmentAgent(BaseAgent):
             "violations_detected": len(self.violations),
         }
     
-    def generate_message(self) -> Dict[str, Any]:
+    async def generate_message(self) -> Dict[str, Any]:
         """Generate policy broadcast message"""
         message = self.get_base_message()
         message.update({
@@ -49,7 +49,35 @@ class HospitalAgent(BaseAgent):
         nurses_on_duty: int = None,
     ):
         super().__init__(agent_id, AGENT_TYPE_HOSPITAL, name)
-        
+        self.reset_fields(
+            name,
+            location,
+            total_beds,
+            available_beds,
+            icu_beds,
+            icu_available,
+            oxygen_units,
+            doctors_on_duty,
+            patient_inflow_rate,
+            nurses_on_duty,
+        )
+    
+    def reset_fields(
+        self,
+        name: str,
+        location: tuple,
+        total_beds: int,
+        available_beds: int,
+        icu_beds: int,
+        icu_available: int,
+        oxygen_units: int,
+        doctors_on_duty: int,
+        patient_inflow_rate: float = 1.0,
+        nurses_on_duty: int = None,
+    ):
+        """(Re)initialize hospital resources in place so the agent can be reused across runs"""
+        self._reset_base()
+        self.name = name or self.agent_id
         self.location = location
         self.total_beds = total_beds
         self.available_beds = available_beds
@@ -62,6 +90,7 @@ class HospitalAgent(BaseAgent):
         
         # Patient tracking with ESI levels
         self.patients_admitted: List[Dict[str, Any]] = []  # Now stores {id, esi_level, admitted_at}
+        self._admitted_oxygen_lpm: float = 0.0  # Running sum of admitted patients' consumption
         self.pending_requests: List[Dict] = []
         self.incoming_ambulances: List[str] = []
         
@@ -83,13 +112,9 @@ class HospitalAgent(BaseAgent):
     @property
     def current_oxygen_consumption_lpm(self) -> float:
         """Calculate current oxygen consumption in liters per minute based on patient acuity"""
-        total_lpm = 0.0
-        for patient in self.patients_admitted:
-            esi = patient.get("esi_level", 3)
-            total_lpm += OXYGEN_CONSUMPTION_LPM.get(esi, 4.0)
+        # Admitted patients' share is kept up to date on admit/discharge;
         # ICU patients not in admitted list also consume oxygen
-        total_lpm += self.icu_patients * OXYGEN_CONSUMPTION_LPM[1]
-        return total_lpm
+        return self._admitted_oxygen_lpm + self.icu_patients * OXYGEN_CONSUMPTION_LPM[1]
     
     @property
     def oxygen_hours_remaining(self) -> float:
@@ -201,7 +226,7 @@ class HospitalAgent(BaseAgent):
             "patient_inflow_rate": self.patient_inflow_rate,
         }
     
-    def generate_message(self) -> Dict[str, Any]:
+    async def generate_message(self) -> Dict[str, Any]:
         """Generate status message for negotiation"""
         message = self.get_base_message()
         message.update({
@@ -322,6 +347,7 @@ class HospitalAgent(BaseAgent):
         
         if supply_type == "oxygen":
             self.oxygen_units += quantity
+            self.is_dirty = True
             self.log_action("supply_received", {
                 "type": "oxygen",
                 "quantity": quantity,
@@ -367,6 +393,8 @@ class HospitalAgent(BaseAgent):
             patient_record["unit"] = "General"
         
         self.patients_admitted.append(patient_record)
+        self._admitted_oxygen_lpm += OXYGEN_CONSUMPTION_LPM.get(esi_level, 4.0)
+        self.is_dirty = True
         return True
     
     def update(self, tick: int) -> List[Dict[str, Any]]:
@@ -375,13 +403,17 @@ class HospitalAgent(BaseAgent):
         
         # Consume oxygen based on current patient acuity (per tick = ~5 min simulation time)
         oxygen_consumed = self.current_oxygen_consumption_lpm * 5  # 5 minutes per tick
-        self.oxygen_units = max(0, self.oxygen_units - oxygen_consumed)
+        if oxygen_consumed and self.oxygen_units:
+            self.oxygen_units = max(0, self.oxygen_units - oxygen_consumed)
+            self.is_dirty = True
         
         # Patients may be discharged (simplified: every 5 ticks)
         if tick % 5 == 0 and self.patients_admitted:
             # Discharge lowest acuity patient first
             self.patients_admitted.sort(key=lambda p: -p.get("esi_level", 3))
             discharged = self.patients_admitted.pop()
+            self.is_dirty = True
+            self._admitted_oxygen_lpm -= OXYGEN_CONSUMPTION_LPM.get(discharged.get("esi_level", 3), 4.0)
             
             if discharged.get("unit") == "ICU":
                 self.icu_available = min(self.icu_available + 1, self.icu_beds)
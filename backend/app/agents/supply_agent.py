@@ -31,7 +31,29 @@ class SupplyAgent(BaseAgent):
         delivery_vehicles: int = 4,
     ):
         super().__init__(agent_id, AGENT_TYPE_SUPPLY, name)
-        
+        self.reset_fields(
+            name,
+            location,
+            food_units,
+            water_units,
+            oxygen_units,
+            medicine_units,
+            delivery_vehicles,
+        )
+    
+    def reset_fields(
+        self,
+        name: str,
+        location: Tuple[float, float],
+        food_units: int = 500,
+        water_units: int = 1000,
+        oxygen_units: int = 200,
+        medicine_units: int = 300,
+        delivery_vehicles: int = 4,
+    ):
+        """(Re)initialize inventory and deliveries in place so the agent can be reused across runs"""
+        self._reset_base()
+        self.name = name or self.agent_id
         self.location = location
         
         # Inventory
@@ -88,7 +110,7 @@ class SupplyAgent(BaseAgent):
             "completed_deliveries": len(self.completed_deliveries),
         }
     
-    def generate_message(self) -> Dict[str, Any]:
+    async def generate_message(self) -> Dict[str, Any]:
         """Generate status message for negotiation"""
         message = self.get_base_message()
         message.update({
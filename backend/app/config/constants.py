@@ -60,6 +60,14 @@ SEVERITY_TO_ESI = {
 
 ESI_TO_SEVERITY = {v: k for k, v in SEVERITY_TO_ESI.items()}
 
+# Integer codes stored alongside the severity/status strings of casualty records
+SEVERITY_CODES = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+STATUS_CODES = {"waiting": 0, "assigned": 1, "in_transit": 2, "admitted": 3}
+
+SEVERITY_CODE_CRITICAL = SEVERITY_CODES["critical"]
+STATUS_CODE_WAITING = STATUS_CODES["waiting"]
+STATUS_CODE_ASSIGNED = STATUS_CODES["assigned"]
+
 # Priority Levels (legacy support, now derived from ESI)
 PRIORITY_CRITICAL = ESI_LEVELS[1]["priority_weight"]
 PRIORITY_HIGH = ESI_LEVELS[2]["priority_weight"]
@@ -16,6 +16,13 @@ from fastapi.responses import JSONResponse
 from typing import Optional
 import asyncio
 
+try:
+    # orjson is optional; FastAPI's ORJSONResponse needs it installed
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:
+    FastJSONResponse = JSONResponse
+
 from .simulation.simulator import Simulator
 
 # Initialize FastAPI app
@@ -67,7 +74,7 @@ async def start_simulation():
 async def simulation_step():
     """Execute one simulation tick"""
     try:
-        result = simulator.step()
+        result = await simulator.step()
         return {
             "success": True,
             **result,
@@ -84,7 +91,7 @@ async def run_simulation(ticks: int = 5):
     
     results = []
     for _ in range(ticks):
-        result = simulator.step()
+        result = await simulator.step()
         results.append(result)
     
     return {
@@ -126,15 +133,19 @@ async def get_metrics():
 
 
 @app.get("/decisions")
-async def get_decisions(limit: int = 20):
-    """Get recent decisions with explanations"""
+async def get_decisions(limit: int = 20, legacy: bool = False):
+    """Get recent decisions with explanations (legacy=true also fills the old "explanation" field)"""
     try:
         decisions = simulator.get_decisions(limit)
-        return {
+        if legacy:
+            for decision in decisions:
+                decision["explanation"] = decision["text"]
+        # Decisions are plain JSON-ready dicts, so skip FastAPI's encoder pass
+        return FastJSONResponse({
             "success": True,
             "count": len(decisions),
             "decisions": decisions,
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -85,11 +85,11 @@ class MetricsTracker:
         """Record that a shortage was avoided"""
         self.supply_shortages_avoided += 1
     
-    def record_tick(self, tick: int, hospitals: Dict, ambulances: Dict):
+    def record_tick(self, tick: int, hospitals: Dict, ambulances: Dict, ts: Optional[str] = None):
         """Record metrics for a simulation tick"""
         tick_data = {
             "tick": tick,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts or datetime.now().isoformat(),
             "avg_response_time": self.get_average_response_time(),
             "patients_served": len(self.response_times),
             "critical_served": self.critical_patients_served,
@@ -1,5 +1,5 @@
 # Optimization Package
 from .objective import ObjectiveFunction
-from .constraints import ConstraintChecker
+from .constraints import ConstraintChecker, Violation
 
-__all__ = ["ObjectiveFunction", "ConstraintChecker"]
+__all__ = ["ObjectiveFunction", "ConstraintChecker", "Violation"]
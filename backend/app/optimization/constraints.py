@@ -3,13 +3,36 @@ Constraints: Enforces system constraints on allocations
 Prevents invalid states like negative beds or over-capacity ambulances
 """
 
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 from ..config.constants import (
     OXYGEN_CRITICAL_LEVEL,
     AMBULANCE_CAPACITY,
 )
 
 
+class Violation(NamedTuple):
+    """A single constraint violation; materialized to a dict only for reporting"""
+    type: str
+    agent: Optional[str]
+    constraint: str
+    actual: Any
+    severity: str
+    extra: Optional[Dict[str, Any]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dict form used in summaries and API responses"""
+        record = {
+            "type": self.type,
+            "agent": self.agent,
+            "constraint": self.constraint,
+            "actual": self.actual,
+            "severity": self.severity,
+        }
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+
 class ConstraintChecker:
     """
     Constraint checker that validates allocation decisions.
@@ -17,7 +40,7 @@ class ConstraintChecker:
     """
     
     def __init__(self):
-        self.violations: List[Dict] = []
+        self.violations: List[Violation] = []
     
     def reset(self):
         """Reset violations for new round"""
@@ -29,109 +52,146 @@ class ConstraintChecker:
         ambulances: Dict[str, Dict],
         supply: Dict,
         proposed_allocations: List[Dict],
-    ) -> Tuple[bool, List[Dict]]:
+        fast_fail: bool = False,
+    ) -> Tuple[bool, List[Violation]]:
         """
         Check all constraints against proposed allocations.
         Returns (is_valid, list_of_violations)
+        
+        With fast_fail=True, checking stops at the first critical violation
+        and only that violation is returned (for callers that just need is_valid).
         """
         self.reset()
         
-        # Check hospital constraints
-        self._check_hospital_constraints(hospitals)
-        
-        # Check ambulance constraints
-        self._check_ambulance_constraints(ambulances)
-        
-        # Check supply constraints
-        self._check_supply_constraints(supply)
+        # Hospital, ambulance and supply checks each return their own violations
+        checks = (
+            (self._check_hospital_constraints, hospitals),
+            (self._check_ambulance_constraints, ambulances),
+            (self._check_supply_constraints, supply),
+        )
+        for check, state in checks:
+            found = check(state, fast_fail)
+            if fast_fail and self._aborted(found):
+                self.violations = found[-1:]
+                return False, self.violations
+            self.violations.extend(found)
         
         # Check allocation-specific constraints
         for allocation in proposed_allocations:
-            self._check_allocation_constraints(allocation, hospitals, ambulances)
+            found = self._check_allocation_constraints(allocation, hospitals, ambulances, fast_fail)
+            if fast_fail and self._aborted(found):
+                self.violations = found[-1:]
+                return False, self.violations
+            self.violations.extend(found)
         
         is_valid = len(self.violations) == 0
         return is_valid, self.violations
     
-    def _check_hospital_constraints(self, hospitals: Dict[str, Dict]):
-        """Check hospital capacity constraints"""
+    @staticmethod
+    def _aborted(found: List[Violation]) -> bool:
+        """A sub-check run with abort_on_critical stops right after its first critical violation"""
+        return bool(found) and found[-1].severity == "critical"
+    
+    def _check_hospital_constraints(self, hospitals: Dict[str, Dict], abort_on_critical: bool = False) -> List[Violation]:
+        """Check hospital capacity constraints. Stops at the first critical one if abort_on_critical"""
+        violations = []
         for h_id, h_state in hospitals.items():
             # Bed capacity cannot be negative
             if h_state.get("available_beds", 0) < 0:
-                self.violations.append({
-                    "type": "hospital_capacity",
-                    "agent": h_id,
-                    "constraint": "available_beds >= 0",
-                    "actual": h_state.get("available_beds"),
-                    "severity": "critical",
-                })
+                violations.append(Violation(
+                    "hospital_capacity",
+                    h_id,
+                    "available_beds >= 0",
+                    h_state.get("available_beds"),
+                    "critical",
+                ))
+                if abort_on_critical:
+                    return violations
             
             # ICU cannot be negative
             if h_state.get("icu_available", 0) < 0:
-                self.violations.append({
-                    "type": "hospital_icu",
-                    "agent": h_id,
-                    "constraint": "icu_available >= 0",
-                    "actual": h_state.get("icu_available"),
-                    "severity": "critical",
-                })
+                violations.append(Violation(
+                    "hospital_icu",
+                    h_id,
+                    "icu_available >= 0",
+                    h_state.get("icu_available"),
+                    "critical",
+                ))
+                if abort_on_critical:
+                    return violations
             
             # Oxygen warning (soft constraint)
             if h_state.get("oxygen_units", 100) < OXYGEN_CRITICAL_LEVEL:
-                self.violations.append({
-                    "type": "hospital_oxygen",
-                    "agent": h_id,
-                    "constraint": f"oxygen >= {OXYGEN_CRITICAL_LEVEL}",
-                    "actual": h_state.get("oxygen_units"),
-                    "severity": "warning",
-                })
+                violations.append(Violation(
+                    "hospital_oxygen",
+                    h_id,
+                    f"oxygen >= {OXYGEN_CRITICAL_LEVEL}",
+                    h_state.get("oxygen_units"),
+                    "warning",
+                ))
+        
+        return violations
     
-    def _check_ambulance_constraints(self, ambulances: Dict[str, Dict]):
-        """Check ambulance capacity constraints"""
+    def _check_ambulance_constraints(self, ambulances: Dict[str, Dict], abort_on_critical: bool = False) -> List[Violation]:
+        """Check ambulance capacity constraints. Stops at the first critical one if abort_on_critical"""
+        violations = []
         for a_id, a_state in ambulances.items():
             current_load = a_state.get("current_load", 0)
             capacity = a_state.get("capacity", AMBULANCE_CAPACITY)
             
             # Cannot exceed capacity
             if current_load > capacity:
-                self.violations.append({
-                    "type": "ambulance_capacity",
-                    "agent": a_id,
-                    "constraint": f"load <= {capacity}",
-                    "actual": current_load,
-                    "severity": "critical",
-                })
+                violations.append(Violation(
+                    "ambulance_capacity",
+                    a_id,
+                    f"load <= {capacity}",
+                    current_load,
+                    "critical",
+                ))
+                if abort_on_critical:
+                    return violations
             
             # Fuel warning
             if a_state.get("fuel", 100) < 15:
-                self.violations.append({
-                    "type": "ambulance_fuel",
-                    "agent": a_id,
-                    "constraint": "fuel >= 15%",
-                    "actual": a_state.get("fuel"),
-                    "severity": "warning",
-                })
+                violations.append(Violation(
+                    "ambulance_fuel",
+                    a_id,
+                    "fuel >= 15%",
+                    a_state.get("fuel"),
+                    "warning",
+                ))
+        
+        return violations
     
-    def _check_supply_constraints(self, supply: Dict):
-        """Check supply inventory constraints"""
+    def _check_supply_constraints(self, supply: Dict, abort_on_critical: bool = False) -> List[Violation]:
+        """Check supply inventory constraints. Stops at the first critical one if abort_on_critical"""
+        violations = []
         inventory = supply.get("inventory", {})
         
         for supply_type, quantity in inventory.items():
             if quantity < 0:
-                self.violations.append({
-                    "type": "supply_inventory",
-                    "resource": supply_type,
-                    "constraint": f"{supply_type} >= 0",
-                    "actual": quantity,
-                    "severity": "critical",
-                })
+                violations.append(Violation(
+                    "supply_inventory",
+                    None,
+                    f"{supply_type} >= 0",
+                    quantity,
+                    "critical",
+                    {"resource": supply_type},
+                ))
+                if abort_on_critical:
+                    return violations
+        
+        return violations
     
     def _check_allocation_constraints(
         self,
         allocation: Dict,
         hospitals: Dict,
         ambulances: Dict,
-    ):
-        """Check constraints on a specific allocation"""
+        abort_on_critical: bool = False,
+    ) -> List[Violation]:
+        """Check constraints on a specific allocation. Stops at the first critical one if abort_on_critical"""
+        violations = []
         allocation_type = allocation.get("type")
         
         if allocation_type == "patient_assignment":
@@ -143,28 +203,36 @@ class ConstraintChecker:
                 
                 # Critical patients need ICU
                 if patient_severity == "critical" and h_state.get("icu_available", 0) <= 0:
-                    self.violations.append({
-                        "type": "allocation_invalid",
-                        "allocation": allocation,
-                        "constraint": "Critical patient needs ICU",
-                        "reason": "No ICU available",
-                        "severity": "critical",
-                    })
+                    violations.append(Violation(
+                        "allocation_invalid",
+                        hospital_id,
+                        "Critical patient needs ICU",
+                        h_state.get("icu_available", 0),
+                        "critical",
+                        {"allocation": allocation, "reason": "No ICU available"},
+                    ))
+                    if abort_on_critical:
+                        return violations
                 
                 # Regular patients need beds
                 elif patient_severity != "critical" and h_state.get("available_beds", 0) <= 0:
-                    self.violations.append({
-                        "type": "allocation_invalid",
-                        "allocation": allocation,
-                        "constraint": "Patient needs available bed",
-                        "reason": "No beds available",
-                        "severity": "critical",
-                    })
+                    violations.append(Violation(
+                        "allocation_invalid",
+                        hospital_id,
+                        "Patient needs available bed",
+                        h_state.get("available_beds", 0),
+                        "critical",
+                        {"allocation": allocation, "reason": "No beds available"},
+                    ))
+                    if abort_on_critical:
+                        return violations
+        
+        return violations
     
     def get_violations_summary(self) -> Dict[str, Any]:
         """Get summary of all violations"""
-        critical = [v for v in self.violations if v.get("severity") == "critical"]
-        warnings = [v for v in self.violations if v.get("severity") == "warning"]
+        critical = [v.to_dict() for v in self.violations if v.severity == "critical"]
+        warnings = [v.to_dict() for v in self.violations if v.severity == "warning"]
         
         return {
             "total_violations": len(self.violations),
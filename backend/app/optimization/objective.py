@@ -3,12 +3,34 @@ Objective Function: Defines the optimization goal for resource allocation
 Minimizes deaths, delays, and overloads
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Sequence
+from operator import itemgetter
 from ..config.constants import (
     WEIGHT_UNSERVED_CRITICAL,
     WEIGHT_RESPONSE_TIME,
     WEIGHT_OVERLOAD_PENALTY,
     WEIGHT_FAIRNESS,
+    SEVERITY_CODE_CRITICAL,
+    STATUS_CODE_WAITING,
+)
+
+# (severity_code, status_code) of a critical patient still waiting for care
+_severity_status = itemgetter("severity_code", "status_code")
+_UNSERVED_CRITICAL = (SEVERITY_CODE_CRITICAL, STATUS_CODE_WAITING)
+
+
+def _is_unserved_critical(p: Dict) -> bool:
+    """Per-record check for patient dicts that may lack the precomputed codes"""
+    if "severity_code" in p and "status_code" in p:
+        return _severity_status(p) == _UNSERVED_CRITICAL
+    return p.get("severity") == "critical" and p.get("status") == "waiting"
+
+# Cost breakdown keys and their display names, in breakdown order
+_METRICS = (
+    ("unserved_critical_cost", "unserved critical"),
+    ("response_time_cost", "response time"),
+    ("overload_cost", "overload"),
+    ("fairness_cost", "fairness"),
 )
 
 
@@ -34,6 +56,41 @@ class ObjectiveFunction:
         self.weight_overload = weight_overload
         self.weight_fairness = weight_fairness
     
+    def calculate_cost_scalar(
+        self,
+        unserved_critical: int,
+        avg_response_time: float,
+        overloaded_hospitals: int,
+        load_variance: float = 0.0,
+    ) -> float:
+        """
+        Calculate only the unrounded total cost.
+        Use in search/compare inner loops where the breakdown dict isn't needed.
+        """
+        return (
+            unserved_critical * self.weight_unserved
+            + avg_response_time * self.weight_response
+            + overloaded_hospitals * self.weight_overload
+            + load_variance * self.weight_fairness
+        )
+    
+    def calculate_cost_batch(
+        self,
+        unserved_critical: Sequence[int],
+        avg_response_time: Sequence[float],
+        overloaded_hospitals: Sequence[int],
+        load_variance: Sequence[float],
+    ) -> List[float]:
+        """Calculate unrounded total costs for a batch of candidate allocations"""
+        w_unserved = self.weight_unserved
+        w_response = self.weight_response
+        w_overload = self.weight_overload
+        w_fairness = self.weight_fairness
+        return [
+            u * w_unserved + r * w_response + o * w_overload + v * w_fairness
+            for u, r, o, v in zip(unserved_critical, avg_response_time, overloaded_hospitals, load_variance)
+        ]
+    
     def calculate_cost(
         self,
         unserved_critical: int,
@@ -50,7 +107,12 @@ class ObjectiveFunction:
         overload_cost = overloaded_hospitals * self.weight_overload
         fairness_cost = load_variance * self.weight_fairness
         
-        total_cost = unserved_cost + response_cost + overload_cost + fairness_cost
+        total_cost = self.calculate_cost_scalar(
+            unserved_critical,
+            avg_response_time,
+            overloaded_hospitals,
+            load_variance,
+        )
         
         return {
             "total_cost": round(total_cost, 2),
@@ -77,11 +139,12 @@ class ObjectiveFunction:
         """
         Evaluate a current allocation state.
         """
-        # Count unserved critical patients
-        unserved_critical = sum(
-            1 for p in waiting_patients 
-            if p.get("severity") == "critical" and p.get("status") == "waiting"
-        )
+        # Count unserved critical patients (key extraction and count both run in C);
+        # legacy records without severity_code/status_code take the per-record path
+        try:
+            unserved_critical = list(map(_severity_status, waiting_patients)).count(_UNSERVED_CRITICAL)
+        except KeyError:
+            unserved_critical = sum(1 for p in waiting_patients if _is_unserved_critical(p))
         
         # Calculate average response time
         avg_response_time = sum(response_times) / len(response_times) if response_times else 0.0
@@ -126,9 +189,9 @@ class ObjectiveFunction:
         before_breakdown = before.get("breakdown", {})
         after_breakdown = after.get("breakdown", {})
         
-        for metric in before_breakdown:
-            if after_breakdown.get(metric, 0) < before_breakdown.get(metric, 0):
-                improved_metrics.append(metric.replace("_cost", "").replace("_", " "))
+        for metric, label in _METRICS:
+            if metric in before_breakdown and after_breakdown.get(metric, 0) < before_breakdown[metric]:
+                improved_metrics.append(label)
         
         return {
             "before_cost": before_cost,
@@ -7,6 +7,16 @@ import random
 from typing import Dict, List, Any, Tuple
 from datetime import datetime
 import math
+from ..config.constants import SEVERITY_CODES, STATUS_CODE_WAITING
+
+# Disaster event templates; copied only when an event actually fires
+_DISASTER_EVENT_TEMPLATES = (
+    {"type": "aftershock", "severity_increase": 0.2, "duration": 3},
+    {"type": "road_blocked", "affected_routes": 2, "duration": 5},
+    {"type": "power_outage", "affected_hospitals": 1, "duration": 4},
+    {"type": "supply_delay", "delay_minutes": 30, "duration": 2},
+    {"type": "casualty_surge", "extra_patients": 15, "duration": 1},
+)
 
 
 class DataGenerator:
@@ -16,8 +26,15 @@ class DataGenerator:
     """
     
     def __init__(self, seed: int = None):
-        if seed:
-            random.seed(seed)
+        # Private RNG: seeding doesn't touch the global random state,
+        # so concurrent simulations don't interfere
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tick = 0
+    
+    def reset(self, seed: int = None):
+        """Restart from tick 0, reseeding with seed (or the original seed)"""
+        self.rng.seed(self.seed if seed is None else seed)
         self.tick = 0
     
     def generate_initial_casualties(self, count: int, disaster_zones: List[Dict]) -> List[Dict[str, Any]]:
@@ -27,11 +44,11 @@ class DataGenerator:
         
         for i in range(count):
             # Pick a random zone weighted by severity
-            zone = random.choice(disaster_zones)
+            zone = self.rng.choice(disaster_zones)
             
             # Generate location near zone center
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(0, zone["radius"])
+            angle = self.rng.uniform(0, 2 * math.pi)
+            distance = self.rng.uniform(0, zone["radius"])
             location = (
                 zone["center"][0] + distance * math.cos(angle),
                 zone["center"][1] + distance * math.sin(angle)
@@ -43,9 +60,11 @@ class DataGenerator:
             casualties.append({
                 "id": f"patient_{i:03d}",
                 "severity": severity,
+                "severity_code": SEVERITY_CODES[severity],
                 "location": location,
                 "zone": zone["severity"],
                 "status": "waiting",
+                "status_code": STATUS_CODE_WAITING,
                 "assigned_ambulance": None,
                 "assigned_hospital": None,
                 "created_at": datetime.now().isoformat(),
@@ -56,7 +75,7 @@ class DataGenerator:
     def _weighted_choice(self, weights: Dict[str, float]) -> str:
         """Make a weighted random choice"""
         total = sum(weights.values())
-        r = random.uniform(0, total)
+        r = self.rng.uniform(0, total)
         cumulative = 0
         for key, weight in weights.items():
             cumulative += weight
@@ -67,7 +86,7 @@ class DataGenerator:
     def generate_patient_inflow(self, base_rate: float, severity_multiplier: float = 1.0) -> List[Dict[str, Any]]:
         """Generate new patients for a simulation tick"""
         # Poisson-like distribution for patient arrivals
-        num_new = max(0, int(random.gauss(base_rate * severity_multiplier, base_rate * 0.3)))
+        num_new = max(0, int(self.rng.gauss(base_rate * severity_multiplier, base_rate * 0.3)))
         
         new_patients = []
         for i in range(num_new):
@@ -81,8 +100,10 @@ class DataGenerator:
             new_patients.append({
                 "id": f"patient_tick{self.tick}_{i:02d}",
                 "severity": severity,
-                "location": (random.uniform(10, 90), random.uniform(10, 90)),
+                "severity_code": SEVERITY_CODES[severity],
+                "location": (self.rng.uniform(10, 90), self.rng.uniform(10, 90)),
                 "status": "waiting",
+                "status_code": STATUS_CODE_WAITING,
                 "created_at": datetime.now().isoformat(),
             })
         
@@ -100,30 +121,22 @@ class DataGenerator:
         for h_id, h_state in hospitals.items():
             # Oxygen demand based on ICU usage
             icu_usage = 1 - (h_state.get("icu_available", 1) / max(h_state.get("icu_beds", 1), 1))
-            total_demand["oxygen"] += int(20 * icu_usage + random.randint(5, 15))
+            total_demand["oxygen"] += int(20 * icu_usage + self.rng.randint(5, 15))
             
             # Medicine demand based on patient count
             patient_load = 1 - (h_state.get("available_beds", 1) / max(h_state.get("total_beds", 1), 1))
-            total_demand["medicine"] += int(10 * patient_load + random.randint(2, 8))
+            total_demand["medicine"] += int(10 * patient_load + self.rng.randint(2, 8))
             
             # Basic supplies
-            total_demand["food"] += random.randint(10, 30)
-            total_demand["water"] += random.randint(20, 50)
+            total_demand["food"] += self.rng.randint(10, 30)
+            total_demand["water"] += self.rng.randint(20, 50)
         
         return total_demand
     
     def generate_disaster_event(self) -> Dict[str, Any]:
         """Generate a random disaster event that affects the simulation"""
-        event_types = [
-            {"type": "aftershock", "severity_increase": 0.2, "duration": 3},
-            {"type": "road_blocked", "affected_routes": 2, "duration": 5},
-            {"type": "power_outage", "affected_hospitals": 1, "duration": 4},
-            {"type": "supply_delay", "delay_minutes": 30, "duration": 2},
-            {"type": "casualty_surge", "extra_patients": 15, "duration": 1},
-        ]
-        
-        if random.random() < 0.15:  # 15% chance of event per tick
-            event = random.choice(event_types)
+        if self.rng.random() < 0.15:  # 15% chance of event per tick
+            event = dict(self.rng.choice(_DISASTER_EVENT_TEMPLATES))
             event["tick"] = self.tick
             event["timestamp"] = datetime.now().isoformat()
             return event
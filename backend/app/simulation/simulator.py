@@ -3,16 +3,22 @@ Simulator: Main simulation orchestration loop
 Ties together all agents, negotiation, and optimization
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
+from array import array
+from collections import Counter
+from itertools import compress
+import asyncio
 import time
 
+from ..agents.base_agent import BaseAgent
 from ..agents.hospital_agent import HospitalAgent
 from ..agents.ambulance_agent import AmbulanceAgent
 from ..agents.supply_agent import SupplyAgent
 from ..agents.government_agent import GovernmentAgent
 from ..communication.event_bus import EventBus
 from ..state.global_state import GlobalState
+from ..state.agent_states import HospitalState, AmbulanceState
 from ..negotiation.negotiation_engine import NegotiationEngine
 from ..optimization.objective import ObjectiveFunction
 from ..optimization.constraints import ConstraintChecker
@@ -28,6 +34,10 @@ from ..config.scenario import (
     GOVERNMENT_CONFIG,
     DISASTER_ZONES,
 )
+from ..config.constants import (
+    STATUS_CODE_WAITING,
+    STATUS_CODE_ASSIGNED,
+)
 
 
 class Simulator:
@@ -36,10 +46,10 @@ class Simulator:
     This is the engine that makes everything move.
     """
     
-    def __init__(self):
+    def __init__(self, global_state: Optional[GlobalState] = None):
         # Core components
         self.event_bus = EventBus()
-        self.global_state = GlobalState()
+        self.global_state = global_state if global_state is not None else GlobalState()
         self.negotiation_engine = NegotiationEngine()
         self.objective = ObjectiveFunction()
         self.constraints = ConstraintChecker()
@@ -55,11 +65,34 @@ class Simulator:
         self.supply: Optional[SupplyAgent] = None
         self.government: Optional[GovernmentAgent] = None
         
+        # Every agent ever created, kept across resets and reinitialized in place
+        self._agent_pool: Dict[str, BaseAgent] = {}
+        
         # Simulation state
         self.tick: int = 0
         self.running: bool = False
         self.waiting_patients: List[Dict] = []
         
+        # Column view of waiting_patients: status/severity codes by patient index
+        self._pid_to_idx: Dict[str, int] = {}
+        self._patient_status = array("b")
+        self._patient_severity = array("b")
+        # IDs of patients still waiting; discarded on every status transition
+        self._waiting_ids: Set[str] = set()
+        # Waiting patients per severity, kept in step with _waiting_ids
+        self.severity_counts: Counter = Counter()
+        
+        # Agent state dicts, rebuilt once whenever the agents advance
+        self._h_states: Dict[str, Dict] = {}
+        self._a_states: Dict[str, Dict] = {}
+        # IDs whose cached state was rebuilt but not yet pushed to global state
+        self._unsynced_hospitals: Set[str] = set()
+        self._unsynced_ambulances: Set[str] = set()
+        
+        # Government multipliers, reused while their hospital inputs are unchanged
+        self._gov_input_key: Optional[tuple] = None
+        self._gov_priorities: Dict[str, Any] = {}
+        
     def reset(self):
         """Reset everything for a new simulation"""
         self.event_bus.reset()
@@ -67,9 +100,9 @@ class Simulator:
         self.negotiation_engine.reset()
         self.metrics.reset()
         self.explainer.reset()
-        self.failure_handler = FailureHandler()
+        self.failure_handler.reset()
         self.logger.reset()
-        self.data_generator = DataGenerator()
+        self.data_generator.reset()
         
         self.hospitals = {}
         self.ambulances = {}
@@ -78,6 +111,17 @@ class Simulator:
         self.tick = 0
         self.running = False
         self.waiting_patients = []
+        self._pid_to_idx = {}
+        self._patient_status = array("b")
+        self._patient_severity = array("b")
+        self._waiting_ids = set()
+        self.severity_counts = Counter()
+        self._h_states = {}
+        self._a_states = {}
+        self._unsynced_hospitals = set()
+        self._unsynced_ambulances = set()
+        self._gov_input_key = None
+        self._gov_priorities = {}
     
     def initialize(self) -> Dict[str, Any]:
         """Initialize all agents from scenario config"""
@@ -85,7 +129,8 @@ class Simulator:
         
         # Create Hospital Agents
         for h_config in HOSPITALS_CONFIG:
-            hospital = HospitalAgent(
+            hospital = self._pooled_agent(
+                HospitalAgent,
                 agent_id=h_config["id"],
                 name=h_config["name"],
                 location=h_config["location"],
@@ -102,7 +147,8 @@ class Simulator:
         
         # Create Ambulance Agents
         for a_config in AMBULANCES_CONFIG:
-            ambulance = AmbulanceAgent(
+            ambulance = self._pooled_agent(
+                AmbulanceAgent,
                 agent_id=a_config["id"],
                 location=tuple(a_config["location"]),
                 capacity=a_config["capacity"],
@@ -113,7 +159,8 @@ class Simulator:
             self.event_bus.register_agent(a_config["id"], ambulance)
         
         # Create Supply Agent
-        self.supply = SupplyAgent(
+        self.supply = self._pooled_agent(
+            SupplyAgent,
             agent_id=SUPPLY_CONFIG["id"],
             name=SUPPLY_CONFIG["name"],
             location=tuple(SUPPLY_CONFIG["location"]),
@@ -126,7 +173,8 @@ class Simulator:
         self.event_bus.register_agent(SUPPLY_CONFIG["id"], self.supply)
         
         # Create Government Agent
-        self.government = GovernmentAgent(
+        self.government = self._pooled_agent(
+            GovernmentAgent,
             agent_id=GOVERNMENT_CONFIG["id"],
             disaster_severity=GOVERNMENT_CONFIG["disaster_severity"],
             fairness_weight=GOVERNMENT_CONFIG["fairness_weight"],
@@ -134,16 +182,17 @@ class Simulator:
         self.event_bus.register_agent(GOVERNMENT_CONFIG["id"], self.government)
         
         # Generate initial casualties
-        self.waiting_patients = self.data_generator.generate_initial_casualties(
+        self._add_patients(self.data_generator.generate_initial_casualties(
             count=120,
             disaster_zones=DISASTER_ZONES,
-        )
+        ))
         
         # Record initial state
+        self._refresh_state_caches()
         self._sync_global_state()
         self.metrics.start()
         self.metrics.record_initial_state(
-            {h.agent_id: h.get_state() for h in self.hospitals.values()},
+            self._h_states,
             self.waiting_patients,
         )
         self.metrics.patients_waiting = len(self.waiting_patients)
@@ -158,10 +207,10 @@ class Simulator:
             "hospitals": len(self.hospitals),
             "ambulances": len(self.ambulances),
             "initial_patients": len(self.waiting_patients),
-            "critical_patients": sum(1 for p in self.waiting_patients if p["severity"] == "critical"),
+            "critical_patients": self.severity_counts["critical"],
         }
     
-    def step(self) -> Dict[str, Any]:
+    async def step(self) -> Dict[str, Any]:
         """Execute one simulation tick"""
         if not self.running:
             return {"error": "Simulation not running. Call initialize() first."}
@@ -170,16 +219,19 @@ class Simulator:
         self.logger.set_tick(self.tick)
         self.global_state.current_tick = self.tick
         
+        # One wall-clock timestamp for everything recorded during this tick
+        ts = datetime.now().isoformat()
+        
         step_result = {
             "tick": self.tick,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts,
             "actions": [],
             "decisions": [],
             "alerts": [],
         }
         
         # Save state before optimization
-        self.global_state.save_before_state()
+        self.global_state.save_before_state(ts)
         
         # Step 1: Generate new patient inflow
         if self.tick % 3 == 0:  # Every 3 ticks
@@ -187,13 +239,15 @@ class Simulator:
                 base_rate=2.0,
                 severity_multiplier=self.government.disaster_severity,
             )
-            self.waiting_patients.extend(new_patients)
+            self._add_patients(new_patients)
             self.metrics.patients_waiting = len(self.waiting_patients)
         
-        # Step 2: Collect agent messages
-        hospital_messages = [h.generate_message() for h in self.hospitals.values()]
-        ambulance_messages = [a.generate_message() for a in self.ambulances.values()]
-        supply_message = self.supply.generate_message()
+        # Step 2: Collect agent messages concurrently, so slow agents cost max not sum
+        hospital_messages, ambulance_messages, supply_message = await asyncio.gather(
+            asyncio.gather(*(h.generate_message() for h in self.hospitals.values())),
+            asyncio.gather(*(a.generate_message() for a in self.ambulances.values())),
+            self.supply.generate_message(),
+        )
         
         # Add location info to hospital messages
         for msg in hospital_messages:
@@ -202,107 +256,49 @@ class Simulator:
                 msg["location"] = h.location
                 msg["name"] = h.name
         
-        # Step 3: Run negotiation
-        gov_priorities = {
-            "multipliers": self.government.calculate_priority_multipliers(
-                {h.agent_id: h.get_state() for h in self.hospitals.values()}
-            )
-        }
+        # Step 3: Run negotiation (hospitals haven't changed since the last cache refresh)
+        gov_priorities = self._get_gov_priorities()
         
         negotiation_result = self.negotiation_engine.run_negotiation(
             hospital_messages=hospital_messages,
             ambulance_messages=ambulance_messages,
             supply_message=supply_message,
             government_priorities=gov_priorities,
-            waiting_patients=[p for p in self.waiting_patients if p["status"] == "waiting"],
+            waiting_patients=self._get_waiting_patients(),
         )
         
-        # Step 4: Apply allocations
+        # Steps 4-5: Apply allocations and dispatch ambulances in one pass,
+        # looking each patient up once for both. Log and explainer entries are
+        # therefore interleaved per patient (assignment, then its dispatch)
+        # rather than all assignments followed by all dispatches
+        ambulance_by_patient = {
+            aa["patient_id"]: aa for aa in negotiation_result.get("ambulance_assignments", [])
+        }
         for pa in negotiation_result.get("patient_assignments", []):
-            hospital_id = pa["assigned_hospital"]
-            hospital = self.hospitals.get(hospital_id)
-            
-            if hospital and hospital.can_accept_patient(pa["patient_severity"]):
-                # Accept patient
-                patient_id = pa["patient_id"]
-                hospital.accept_patient(patient_id, pa["patient_severity"])
-                
-                # Mark patient as assigned
-                for p in self.waiting_patients:
-                    if p["id"] == patient_id:
-                        p["status"] = "assigned"
-                        p["assigned_hospital"] = hospital_id
-                        break
-                
-                # Log and explain
-                self.logger.log_patient_assignment(patient_id, hospital_id, pa["patient_severity"])
-                self.explainer.explain_patient_assignment(
-                    patient_id=patient_id,
-                    patient_severity=pa["patient_severity"],
-                    assigned_hospital=hospital_id,
-                    hospital_name=pa.get("hospital_name", hospital_id),
-                    distance=10.0,  # Simplified
-                    capacity_available=hospital.available_beds,
-                )
-                
-                # Record metrics
-                self.metrics.record_patient_served(
-                    {"severity": pa["patient_severity"]},
-                    response_time=pa.get("score", 10.0) * 5,
-                )
-                
-                step_result["actions"].append({
-                    "type": "patient_assigned",
-                    "patient": patient_id,
-                    "hospital": hospital_id,
-                })
-        
-        # Step 5: Dispatch ambulances
-        for aa in negotiation_result.get("ambulance_assignments", []):
-            ambulance = self.ambulances.get(aa["ambulance_id"])
-            hospital = self.hospitals.get(aa["hospital_id"])
-            
-            if ambulance and ambulance.is_available and hospital:
-                patient_data = None
-                for p in self.waiting_patients:
-                    if p["id"] == aa["patient_id"]:
-                        patient_data = p
-                        break
-                
-                if patient_data:
-                    ambulance.assign_mission(
-                        patient=patient_data,
-                        hospital_id=aa["hospital_id"],
-                        hospital_location=hospital.location,
-                    )
-                    ambulance.destination = hospital.location
-                    
-                    self.logger.log_ambulance_dispatch(
-                        aa["ambulance_id"],
-                        aa["patient_id"],
-                        aa["hospital_id"],
-                        aa["eta_minutes"],
-                    )
-                    
-                    self.explainer.explain_ambulance_dispatch(
-                        ambulance_id=aa["ambulance_id"],
-                        patient_id=aa["patient_id"],
-                        hospital_id=aa["hospital_id"],
-                        eta_minutes=aa["eta_minutes"],
-                    )
-        
-        # Step 6: Process supply allocations
-        for sa in negotiation_result.get("supply_allocations", []):
-            hospital = self.hospitals.get(sa["hospital_id"])
-            if hospital and sa["resource"] == "oxygen":
-                # Add pending supply request
-                self.supply.pending_requests.append({
-                    "requester_id": sa["hospital_id"],
-                    "requester_location": hospital.location,
-                    "supply_type": sa["resource"],
-                    "quantity": sa["quantity"],
-                    "urgency": sa.get("urgency", "medium"),
-                })
+            patient_id = pa["patient_id"]
+            idx = self._pid_to_idx.get(patient_id)
+            self._apply_patient_assignment(pa, idx, step_result)
+            aa = ambulance_by_patient.pop(patient_id, None)
+            if aa:
+                self._dispatch_ambulance(aa, idx)
+        
+        # Dispatches for patients without a hospital assignment this round
+        for patient_id, aa in ambulance_by_patient.items():
+            self._dispatch_ambulance(aa, self._pid_to_idx.get(patient_id))
+        
+        # Step 6: Process supply allocations, queueing oxygen requests in one batch
+        hospitals = self.hospitals
+        self.supply.pending_requests.extend([
+            {
+                "requester_id": sa["hospital_id"],
+                "requester_location": hospitals[sa["hospital_id"]].location,
+                "supply_type": sa["resource"],
+                "quantity": sa["quantity"],
+                "urgency": sa.get("urgency", "medium"),
+            }
+            for sa in negotiation_result.get("supply_allocations", [])
+            if sa["resource"] == "oxygen" and sa["hospital_id"] in hospitals
+        ])
         
         # Process pending supply deliveries
         deliveries = self.supply.process_pending_requests()
@@ -326,19 +322,24 @@ class Simulator:
         
         self.supply.update(self.tick)
         self.government.update(self.tick)
+        self._refresh_state_caches()
+        
+        # Sync global state (steps 8-9 don't change agent state)
+        self._sync_global_state()
         
-        # Step 8: Check for failures
+        # Step 8: Check for failures against the synced state records
         failures = self.failure_handler.check_and_handle_failures(
-            {h.agent_id: h.get_state() for h in self.hospitals.values()},
-            {a.agent_id: a.get_state() for a in self.ambulances.values()},
-            self.supply.get_state(),
+            self.global_state.hospitals,
+            self.global_state.ambulances,
+            self.global_state.supply,
+            ts,
         )
         for failure_response in failures:
             step_result["alerts"].append(failure_response)
         
         # Step 9: Check for overload prevention
-        for hospital in self.hospitals.values():
-            state = hospital.get_state()
+        for h_id, state in self._h_states.items():
+            hospital = self.hospitals[h_id]
             if state["bed_utilization"] > 80 and state["bed_utilization"] < 90:
                 self.metrics.record_overload_prevented(hospital.agent_id)
                 self.logger.log_overload_prevented(hospital.agent_id, "load_balancing")
@@ -348,12 +349,11 @@ class Simulator:
                     "load_balance",
                 )
         
-        # Sync global state
-        self._sync_global_state()
         self.metrics.record_tick(
             self.tick,
-            {h.agent_id: h.get_state() for h in self.hospitals.values()},
-            {a.agent_id: a.get_state() for a in self.ambulances.values()},
+            self._h_states,
+            self._a_states,
+            ts,
         )
         
         # Add decisions to result
@@ -364,13 +364,155 @@ class Simulator:
         
         return step_result
     
-    def _sync_global_state(self):
-        """Sync all agent states to global state"""
-        for h_id, hospital in self.hospitals.items():
-            self.global_state.update_hospital(h_id, hospital.get_state())
+    def _pooled_agent(self, agent_cls, agent_id: str, **fields) -> BaseAgent:
+        """Reinitialize the pooled agent for agent_id in place, or create and pool a new one"""
+        agent = self._agent_pool.get(agent_id)
+        if type(agent) is agent_cls:
+            agent.reset_fields(**fields)
+        else:
+            agent = agent_cls(agent_id=agent_id, **fields)
+            self._agent_pool[agent_id] = agent
+        return agent
+    
+    def _apply_patient_assignment(self, pa: Dict, idx: Optional[int], step_result: Dict[str, Any]):
+        """Admit an assigned patient (record index idx) if the hospital can take them"""
+        hospital_id = pa["assigned_hospital"]
+        hospital = self.hospitals.get(hospital_id)
+        
+        if hospital and hospital.can_accept_patient(pa["patient_severity"]):
+            # Accept patient
+            patient_id = pa["patient_id"]
+            hospital.accept_patient(patient_id, pa["patient_severity"])
+            
+            # Mark patient as assigned
+            if idx is not None:
+                p = self.waiting_patients[idx]
+                p["status"] = "assigned"
+                p["status_code"] = STATUS_CODE_ASSIGNED
+                p["assigned_hospital"] = hospital_id
+                self._patient_status[idx] = STATUS_CODE_ASSIGNED
+                if patient_id in self._waiting_ids:
+                    self._waiting_ids.remove(patient_id)
+                    self.severity_counts[p["severity"]] -= 1
+            
+            # Log and explain
+            self.logger.log_patient_assignment(patient_id, hospital_id, pa["patient_severity"])
+            self.explainer.explain_patient_assignment(
+                patient_id=patient_id,
+                patient_severity=pa["patient_severity"],
+                assigned_hospital=hospital_id,
+                hospital_name=pa.get("hospital_name", hospital_id),
+                distance=10.0,  # Simplified
+                capacity_available=hospital.available_beds,
+            )
+            
+            # Record metrics
+            self.metrics.record_patient_served(
+                {"severity": pa["patient_severity"]},
+                response_time=pa.get("score", 10.0) * 5,
+            )
+            
+            step_result["actions"].append({
+                "type": "patient_assigned",
+                "patient": patient_id,
+                "hospital": hospital_id,
+            })
+    
+    def _dispatch_ambulance(self, aa: Dict, idx: Optional[int]):
+        """Send an ambulance for the patient at record index idx"""
+        ambulance = self.ambulances.get(aa["ambulance_id"])
+        hospital = self.hospitals.get(aa["hospital_id"])
         
-        for a_id, ambulance in self.ambulances.items():
-            self.global_state.update_ambulance(a_id, ambulance.get_state())
+        if ambulance and ambulance.is_available and hospital:
+            patient_data = self.waiting_patients[idx] if idx is not None else None
+            
+            if patient_data:
+                ambulance.assign_mission(
+                    patient=patient_data,
+                    hospital_id=aa["hospital_id"],
+                    hospital_location=hospital.location,
+                )
+                ambulance.destination = hospital.location
+                
+                self.logger.log_ambulance_dispatch(
+                    aa["ambulance_id"],
+                    aa["patient_id"],
+                    aa["hospital_id"],
+                    aa["eta_minutes"],
+                )
+                
+                self.explainer.explain_ambulance_dispatch(
+                    ambulance_id=aa["ambulance_id"],
+                    patient_id=aa["patient_id"],
+                    hospital_id=aa["hospital_id"],
+                    eta_minutes=aa["eta_minutes"],
+                )
+    
+    def _add_patients(self, patients: List[Dict]):
+        """Append new patient records and their status/severity columns"""
+        for p in patients:
+            self._pid_to_idx[p["id"]] = len(self.waiting_patients)
+            self.waiting_patients.append(p)
+        self._patient_status.extend(p["status_code"] for p in patients)
+        self._patient_severity.extend(p["severity_code"] for p in patients)
+        waiting = [p for p in patients if p["status_code"] == STATUS_CODE_WAITING]
+        self._waiting_ids.update(p["id"] for p in waiting)
+        self.severity_counts.update(p["severity"] for p in waiting)
+    
+    def _get_waiting_patients(self) -> List[Dict]:
+        """Patient records still waiting, selected via the status column"""
+        if not self._waiting_ids:
+            return []
+        return list(compress(
+            self.waiting_patients,
+            map(STATUS_CODE_WAITING.__eq__, self._patient_status),
+        ))
+    
+    def _get_gov_priorities(self) -> Dict[str, Any]:
+        """Government priority multipliers, recomputed only when their hospital inputs change"""
+        # Multipliers depend only on each hospital's critical flag and oxygen level
+        key = tuple(
+            (h_id, state.get("is_critical"), state.get("oxygen_units"))
+            for h_id, state in self._h_states.items()
+        )
+        if key != self._gov_input_key:
+            self._gov_priorities = {
+                "multipliers": self.government.calculate_priority_multipliers(self._h_states)
+            }
+            self._gov_input_key = key
+        return self._gov_priorities
+    
+    def _refresh_state_caches(self):
+        """Rebuild the cached state dicts of hospitals/ambulances marked dirty since the last refresh"""
+        # Copy rather than update in place: callers may still hold the previous dicts
+        self._h_states = self._refresh_states(self.hospitals, self._h_states, self._unsynced_hospitals)
+        self._a_states = self._refresh_states(self.ambulances, self._a_states, self._unsynced_ambulances)
+    
+    @staticmethod
+    def _refresh_states(agents: Dict[str, BaseAgent], cached: Dict[str, Dict], unsynced: Set[str]) -> Dict[str, Dict]:
+        """Return a copy of cached with dirty agents' states rebuilt, recording their IDs in unsynced"""
+        states = dict(cached)
+        for agent_id, agent in agents.items():
+            if agent.is_dirty:
+                states[agent_id] = agent.get_state()
+                agent.is_dirty = False
+                unsynced.add(agent_id)
+        return states
+    
+    def _sync_global_state(self):
+        """Sync changed agent states to global state"""
+        # Walk the caches rather than the sets to keep agent order stable
+        unsynced = self._unsynced_hospitals
+        for h_id, state in self._h_states.items():
+            if h_id in unsynced:
+                self.global_state.update_hospital(h_id, HospitalState(**state))
+        unsynced.clear()
+        
+        unsynced = self._unsynced_ambulances
+        for a_id, state in self._a_states.items():
+            if a_id in unsynced:
+                self.global_state.update_ambulance(a_id, AmbulanceState(**state))
+        unsynced.clear()
         
         if self.supply:
             self.global_state.update_supply(self.supply.get_state())
@@ -383,11 +525,12 @@ class Simulator:
         return {
             "tick": self.tick,
             "running": self.running,
-            "hospitals": {h_id: h.get_state() for h_id, h in self.hospitals.items()},
-            "ambulances": {a_id: a.get_state() for a_id, a in self.ambulances.items()},
+            "hospitals": self._h_states,
+            "ambulances": self._a_states,
             "supply": self.supply.get_state() if self.supply else {},
             "government": self.government.get_state() if self.government else {},
-            "waiting_patients": len([p for p in self.waiting_patients if p["status"] == "waiting"]),
+            "waiting_patients": len(self._waiting_ids),
+            "waiting_by_severity": dict(self.severity_counts),
             "total_patients": len(self.waiting_patients),
         }
     
@@ -1,4 +1,5 @@
 # State Package
 from .global_state import GlobalState
+from .agent_states import HospitalState, AmbulanceState
 
-__all__ = ["GlobalState"]
+__all__ = ["GlobalState", "HospitalState", "AmbulanceState"]
@@ -0,0 +1,55 @@
+"""
+Agent States: Compact per-agent state records held by GlobalState
+Slotted dataclasses instead of dicts; converted to dicts only at the API boundary
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(slots=True)
+class HospitalState:
+    """Hospital state as reported by HospitalAgent.get_state()"""
+    id: str
+    name: str
+    location: Tuple[float, float]
+    total_beds: int
+    available_beds: int
+    bed_utilization: float
+    icu_beds: int
+    icu_available: int
+    icu_utilization: float
+    oxygen_units: int
+    oxygen_consumption_lpm: float
+    oxygen_hours_remaining: float
+    oxygen_status: str
+    doctors_on_duty: int
+    nurses_on_duty: int
+    nurse_patient_ratio: Optional[float]
+    staffing_adequate: bool
+    status: str
+    clinical_status: str
+    is_overloaded: bool
+    is_critical: bool
+    requires_diversion: bool
+    patients_count: int
+    icu_patients: int
+    incoming_ambulances: int
+    patient_inflow_rate: float
+
+
+@dataclass(slots=True)
+class AmbulanceState:
+    """Ambulance state as reported by AmbulanceAgent.get_state()"""
+    id: str
+    name: str
+    location: Tuple[float, float]
+    capacity: int
+    current_load: int
+    fuel: float
+    fuel_status: str
+    status: str
+    available: bool
+    target_hospital: Optional[str]
+    eta_minutes: float
+    patients_delivered: int
@@ -4,37 +4,45 @@ Enables before/after comparison, metrics calculation, and timeline replay
 """
 
 from typing import Dict, List, Any, Optional
+from collections import deque
+from dataclasses import asdict
 from datetime import datetime
-from copy import deepcopy
 import json
 
+from .agent_states import HospitalState, AmbulanceState
+
+
+# (change key, metrics key) pairs reported by _calculate_changes
+_METRIC_DELTAS = (
+    ("patients_served_delta", "total_patients_served"),
+    ("critical_served_delta", "critical_patients_served"),
+    ("overloads_avoided_delta", "overloads_avoided"),
+)
+
+# Snapshots are taken twice per tick; only the most recent ones are ever compared
+MAX_SNAPSHOTS = 64
+
+
+def _clone_nested(d: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a dict and its dict values; everything below that is plain scalars"""
+    return {k: v.copy() if isinstance(v, dict) else v for k, v in d.items()}
+
 
 class GlobalState:
     """
     Centralized state store for the S.A.V.E system.
     Maintains snapshots for before/after comparison.
+    One instance per Simulator, so independent runs can execute side by side.
     """
     
-    _instance = None
-    
-    def __new__(cls):
-        """Singleton pattern - one global state for the entire system"""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
     def __init__(self):
-        if self._initialized:
-            return
-        
         self.current_tick: int = 0
         self.simulation_started: Optional[datetime] = None
         self.simulation_status: str = "idle"  # idle, running, paused, completed
         
         # Agent states (keyed by agent_id)
-        self.hospitals: Dict[str, Dict[str, Any]] = {}
-        self.ambulances: Dict[str, Dict[str, Any]] = {}
+        self.hospitals: Dict[str, HospitalState] = {}
+        self.ambulances: Dict[str, AmbulanceState] = {}
         self.supply: Dict[str, Any] = {}
         self.government: Dict[str, Any] = {}
         
@@ -48,7 +56,7 @@ class GlobalState:
         self.allocations: List[Dict[str, Any]] = []
         
         # Snapshots for before/after comparison
-        self._snapshots: List[Dict[str, Any]] = []
+        self._snapshots: deque = deque(maxlen=MAX_SNAPSHOTS)
         self._before_state: Optional[Dict[str, Any]] = None
         
         # Metrics
@@ -59,10 +67,13 @@ class GlobalState:
             "average_response_time": 0.0,
             "overloads_avoided": 0,
             "supplies_delivered": 0,
-            "total_response_times": [],
+            "response_time_count": 0,
         }
         
-        self._initialized = True
+        # export_state() cache, invalidated by bumping _mutation_counter on every write
+        self._mutation_counter: int = 0
+        self._cached_key: Optional[tuple] = None
+        self._cached_json: Optional[str] = None
     
     def reset(self):
         """Reset the global state for a new simulation"""
@@ -78,7 +89,7 @@ class GlobalState:
         self.unserved_critical = []
         self.decisions = []
         self.allocations = []
-        self._snapshots = []
+        self._snapshots = deque(maxlen=MAX_SNAPSHOTS)
         self._before_state = None
         self.metrics = {
             "lives_saved": 0,
@@ -87,33 +98,39 @@ class GlobalState:
             "average_response_time": 0.0,
             "overloads_avoided": 0,
             "supplies_delivered": 0,
-            "total_response_times": [],
+            "response_time_count": 0,
         }
+        # Keep counting rather than restarting at 0 so pre-reset cache keys can't match
+        self._mutation_counter += 1
     
     def start_simulation(self):
         """Mark simulation as started"""
         self.simulation_started = datetime.now()
         self.simulation_status = "running"
+        self._mutation_counter += 1
         self.take_snapshot("simulation_start")
     
-    def take_snapshot(self, label: str = "") -> Dict[str, Any]:
+    def take_snapshot(self, label: str = "", ts: Optional[str] = None) -> Dict[str, Any]:
         """Take a snapshot of current state for comparison"""
         snapshot = {
             "label": label,
             "tick": self.current_tick,
-            "timestamp": datetime.now().isoformat(),
-            "hospitals": deepcopy(self.hospitals),
-            "ambulances": deepcopy(self.ambulances),
-            "supply": deepcopy(self.supply),
-            "metrics": deepcopy(self.metrics),
+            "timestamp": ts or datetime.now().isoformat(),
+            # Agent state records are rebuilt on every update, never mutated in place,
+            # so snapshots can share them; they are converted to dicts only when a
+            # snapshot leaves through get_before_after_comparison
+            "hospitals": dict(self.hospitals),
+            "ambulances": dict(self.ambulances),
+            "supply": _clone_nested(self.supply),
+            "metrics": dict(self.metrics),
             "unserved_critical_count": len(self.unserved_critical),
         }
         self._snapshots.append(snapshot)
         return snapshot
     
-    def save_before_state(self):
+    def save_before_state(self, ts: Optional[str] = None):
         """Save state before negotiation/optimization for comparison"""
-        self._before_state = self.take_snapshot("before_optimization")
+        self._before_state = self.take_snapshot("before_optimization", ts)
     
     def get_before_after_comparison(self) -> Dict[str, Any]:
         """Get before/after comparison of the last optimization"""
@@ -123,59 +140,81 @@ class GlobalState:
         after_state = self.take_snapshot("after_optimization")
         
         return {
-            "before": self._before_state,
-            "after": after_state,
+            "before": self._serialize_snapshot(self._before_state),
+            "after": self._serialize_snapshot(after_state),
             "changes": self._calculate_changes(self._before_state, after_state)
         }
     
+    @staticmethod
+    def _serialize_snapshot(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a snapshot with its agent state records as plain dicts, matching get_full_state"""
+        return {
+            **snapshot,
+            "hospitals": {h_id: asdict(h) for h_id, h in snapshot["hospitals"].items()},
+            "ambulances": {a_id: asdict(a) for a_id, a in snapshot["ambulances"].items()},
+        }
+    
     def _calculate_changes(self, before: Dict, after: Dict) -> Dict[str, Any]:
         """Calculate what changed between two states"""
+        before_metrics = before["metrics"]
+        after_metrics = after["metrics"]
         changes = {
-            "patients_served_delta": after["metrics"]["total_patients_served"] - before["metrics"]["total_patients_served"],
-            "critical_served_delta": after["metrics"]["critical_patients_served"] - before["metrics"]["critical_patients_served"],
-            "overloads_avoided_delta": after["metrics"]["overloads_avoided"] - before["metrics"]["overloads_avoided"],
-            "hospital_changes": [],
+            delta: after_metrics[metric] - before_metrics[metric]
+            for delta, metric in _METRIC_DELTAS
         }
         
+        hospital_changes = []
+        before_hospitals = before["hospitals"]
         for h_id, h_state in after["hospitals"].items():
-            if h_id in before["hospitals"]:
-                b_state = before["hospitals"][h_id]
-                if h_state.get("available_beds", 0) != b_state.get("available_beds", 0):
-                    changes["hospital_changes"].append({
-                        "hospital_id": h_id,
-                        "beds_before": b_state.get("available_beds", 0),
-                        "beds_after": h_state.get("available_beds", 0),
-                    })
+            b_state = before_hospitals.get(h_id)
+            # Snapshots share unchanged state records, so the same object means no change
+            if b_state is None or b_state is h_state:
+                continue
+            beds_before = b_state.available_beds
+            beds_after = h_state.available_beds
+            if beds_after != beds_before:
+                hospital_changes.append({
+                    "hospital_id": h_id,
+                    "beds_before": beds_before,
+                    "beds_after": beds_after,
+                })
+        changes["hospital_changes"] = hospital_changes
         
         return changes
     
-    def update_hospital(self, hospital_id: str, state: Dict[str, Any]):
+    def update_hospital(self, hospital_id: str, state: HospitalState):
         """Update a hospital's state"""
         self.hospitals[hospital_id] = state
+        self._mutation_counter += 1
     
-    def update_ambulance(self, ambulance_id: str, state: Dict[str, Any]):
+    def update_ambulance(self, ambulance_id: str, state: AmbulanceState):
         """Update an ambulance's state"""
         self.ambulances[ambulance_id] = state
+        self._mutation_counter += 1
     
     def update_supply(self, state: Dict[str, Any]):
         """Update supply chain state"""
         self.supply = state
+        self._mutation_counter += 1
     
     def update_government(self, state: Dict[str, Any]):
         """Update government agent state"""
         self.government = state
+        self._mutation_counter += 1
     
-    def add_decision(self, decision: Dict[str, Any]):
-        """Add a decision to the log"""
+    def add_decision(self, decision: Dict[str, Any], ts: Optional[str] = None):
+        """Add a decision to the log. Pass ts to reuse a timestamp already taken this tick"""
         decision["tick"] = self.current_tick
-        decision["timestamp"] = datetime.now().isoformat()
+        decision["timestamp"] = ts or datetime.now().isoformat()
         self.decisions.append(decision)
+        self._mutation_counter += 1
     
-    def add_allocation(self, allocation: Dict[str, Any]):
-        """Add an allocation to the log"""
+    def add_allocation(self, allocation: Dict[str, Any], ts: Optional[str] = None):
+        """Add an allocation to the log. Pass ts to reuse a timestamp already taken this tick"""
         allocation["tick"] = self.current_tick
-        allocation["timestamp"] = datetime.now().isoformat()
+        allocation["timestamp"] = ts or datetime.now().isoformat()
         self.allocations.append(allocation)
+        self._mutation_counter += 1
     
     def mark_patient_served(self, patient_id: str, was_critical: bool = False):
         """Mark a patient as served"""
@@ -186,16 +225,22 @@ class GlobalState:
             self.metrics["lives_saved"] += 1
             if patient_id in self.unserved_critical:
                 self.unserved_critical.remove(patient_id)
+        self._mutation_counter += 1
     
     def add_response_time(self, response_time: float):
         """Add a response time measurement"""
-        self.metrics["total_response_times"].append(response_time)
-        if self.metrics["total_response_times"]:
-            self.metrics["average_response_time"] = sum(self.metrics["total_response_times"]) / len(self.metrics["total_response_times"])
+        # Running mean: O(1) per sample instead of re-summing every response time
+        metrics = self.metrics
+        metrics["response_time_count"] += 1
+        metrics["average_response_time"] += (
+            (response_time - metrics["average_response_time"]) / metrics["response_time_count"]
+        )
+        self._mutation_counter += 1
     
     def record_overload_avoided(self):
         """Record that an overload was avoided"""
         self.metrics["overloads_avoided"] += 1
+        self._mutation_counter += 1
     
     def increment_tick(self):
         """Move to next simulation tick"""
@@ -207,8 +252,8 @@ class GlobalState:
             "tick": self.current_tick,
             "status": self.simulation_status,
             "started_at": self.simulation_started.isoformat() if self.simulation_started else None,
-            "hospitals": self.hospitals,
-            "ambulances": self.ambulances,
+            "hospitals": {h_id: asdict(h) for h_id, h in self.hospitals.items()},
+            "ambulances": {a_id: asdict(a) for a_id, a in self.ambulances.items()},
             "supply": self.supply,
             "government": self.government,
             "metrics": self.metrics,
@@ -222,5 +267,9 @@ class GlobalState:
         return self.decisions[-limit:]
     
     def export_state(self) -> str:
-        """Export full state as JSON"""
-        return json.dumps(self.get_full_state(), indent=2, default=str)
+        """Export full state as JSON, reusing the last export if nothing changed since"""
+        key = (self.current_tick, self._mutation_counter)
+        if key != self._cached_key:
+            self._cached_json = json.dumps(self.get_full_state(), indent=2, default=str)
+            self._cached_key = key
+        return self._cached_json
@@ -1,6 +1,6 @@
 # Utils Package
-from .explainer import DecisionExplainer
+from .explainer import DecisionExplainer, Explanation
 from .failure_handler import FailureHandler
-from .logger import SimulationLogger
+from .logger import SimulationLogger, LogEvent
 
-__all__ = ["DecisionExplainer", "FailureHandler", "SimulationLogger"]
+__all__ = ["DecisionExplainer", "Explanation", "FailureHandler", "SimulationLogger", "LogEvent"]
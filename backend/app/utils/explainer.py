@@ -3,31 +3,204 @@ Decision Explainer: Generates human-readable clinical explanations for decisions
 Uses medical terminology for trust and credibility in healthcare settings
 """
 
+import sys
+from bisect import bisect_left, bisect_right
 from typing import Dict, List, Any, Optional
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from itertools import islice
 from ..config.constants import ESI_LEVELS, SEVERITY_TO_ESI
 
+# Explanations kept in memory; older ones are evicted first
+MAX_EXPLANATIONS = 2000
+
+
+def _interned(table: Dict[Any, str]) -> Dict[Any, str]:
+    """Intern a fixed vocabulary so every explanation shares one object per phrase"""
+    return {key: sys.intern(value) for key, value in table.items()}
+
+
+# ESI level -> category name and "ESI-n (Name)" triage description
+_ESI_NAME = _interned({esi: level["name"] for esi, level in ESI_LEVELS.items()})
+_ESI_DESC = _interned({esi: f"ESI-{esi} ({name})" for esi, name in _ESI_NAME.items()})
+
+# Explanation text/short templates, rendered from each record's fields on first access
+_ASSIGN_TEXT = "Patient {pid} ({triage}) transferred to {hospital}. Clinical rationale: {reasons}."
+_ASSIGN_SHORT = "Patient {pid} ({triage}) → {hospital}"
+# Distance (km) bands: below 10, below 25, anything further
+_DISTANCE_LIMITS = (10, 25)
+_DISTANCE_REASONS = (
+    "nearest definitive care facility ({:.1f}km)",
+    "accessible facility within response radius ({:.1f}km)",
+    "available capacity despite distance ({:.1f}km)",
+)
+# Available-bed bands: up to 5, up to 20, more than 20
+_CAPACITY_LIMITS = (5, 20)
+_CAPACITY_REASONS = (
+    "limited but available capacity",
+    "sufficient capacity to ensure safe admission ({} beds)",
+    "adequate bed availability ({} beds)",
+)
+_ALTERNATIVES = "optimal choice among {} assessed facilities"
+_REROUTE_TEXT = (
+    "Patient diversion approved: {pid} {triage} redirected from {src} to {dst}. "
+    "Clinical rationale: {reason}."
+)
+_REROUTE_SHORT = "Patient diversion: {pid} → {dst}"
+_SUPPLY_TEXT = "{supply_title} reallocation: {qty} units dispatched to {hospital} ({urgency}).{tail}"
+_SUPPLY_HOURS = " Current reserve: ≈{:.1f} hours at current consumption."
+_SUPPLY_SHORT = "Supply dispatch: {qty} {supply} → {hospital}"
+_DISPATCH_TEXT = "Ambulance unit {amb} deployed{triage} to {hospital}. ETA: {eta:.0f} minutes{distance}.{golden}"
+_DISPATCH_DISTANCE = " ({:.1f}km)"
+_DISPATCH_TRIAGE = " for {} patient"
+_DISPATCH_SHORT = "Ambulance {amb} dispatched: {pid} → {hospital} ({eta:.0f}min)"
+_SURGE_TEXT = "Surge protocol activated at {hospital}. Trigger: {trigger}.{actions}"
+_SURGE_ACTIONS = " Actions initiated: {}."
+_SURGE_SHORT = "Surge protocol: {hospital}"
+_OVERLOAD_TEXT = (
+    "Facility overload prevented at {hospital}. Intervention: {action}. "
+    "Continuity of care maintained."
+)
+_OVERLOAD_SHORT = "Overload prevented: {hospital}"
+_OVERRIDE_TEXT = "Regional authority directive: {kind} affecting {target}. Directive: {directive}"
+_OVERRIDE_SHORT = "Authority directive: {kind}"
+_ICU_TEXT = (
+    "No ICU capacity available within {region}. "
+    "System-wide ICU availability: {icu} beds. Escalation initiated: {action}."
+)
+_ICU_SHORT = "ICU escalation: {region} ({icu} beds available)"
+
+# (explanation type, label) in the order generate_summary reports them
+_SUMMARY_LABELS = (
+    ("patient_assignment", "patient transfer(s)"),
+    ("patient_diversion", "patient diversion(s)"),
+    ("supply_allocation", "supply dispatch(es)"),
+    ("overload_prevention", "overload intervention(s)"),
+    ("surge_activation", "surge activation(s)"),
+    ("ambulance_dispatch", "ambulance deployment(s)"),
+)
+
+# Diversion reason -> clinical rationale
+_REASON_MAP = _interned({
+    "overload": "surge protocol activated at original destination",
+    "oxygen_shortage": "oxygen reserves insufficient for safe care delivery",
+    "icu_full": "critical care saturation at original facility",
+    "faster_delivery": "alternative pathway reduces time to definitive care",
+    "load_balancing": "regional load distribution to maintain system capacity",
+    "diversion": "mandatory patient diversion per facility status",
+})
+
+# Supply request urgency -> resupply wording
+_URGENCY_TEXT = _interned({
+    "critical": "emergent resupply",
+    "high": "priority resupply",
+    "medium": "scheduled resupply",
+    "low": "routine restocking",
+})
+
+# Supply type -> clinical name
+_SUPPLY_DESC = _interned({
+    "oxygen": "medical oxygen",
+    "blood_products": "blood products",
+    "medications": "essential medications",
+    "ppe": "personal protective equipment",
+    "iv_fluids": "IV fluids",
+})
+
+# Surge trigger -> description
+_TRIGGER_DESC = _interned({
+    "bed_capacity": "bed utilization exceeded surge threshold",
+    "icu_saturation": "critical care saturation detected",
+    "oxygen_shortage": "oxygen reserves below safe operating threshold",
+    "staffing": "staffing ratios below clinical standards",
+    "mass_casualty": "mass-casualty incident declared",
+})
+
+# Government override type -> directive name
+_OVERRIDE_DESC = _interned({
+    "priority_escalation": "Regional priority escalation",
+    "resource_reallocation": "Resource reallocation directive",
+    "facility_designation": "Facility designation order",
+    "surge_declaration": "Regional surge declaration",
+    "mutual_aid": "Mutual aid activation",
+})
+
+# Overload intervention -> description ("redirect" is formatted per call)
+_OVERLOAD_REDIRECT = "{} patients diverted to alternate facilities"
+_OVERLOAD_ACTIONS = _interned({
+    "supply_boost": "emergent medical supplies dispatched",
+    "capacity_expansion": "surge capacity resources activated",
+    "load_balance": "regional patient distribution rebalanced",
+    "diversion_order": "patient diversion order issued",
+})
+
+
+@dataclass(slots=True)
+class Explanation:
+    """
+    A single explained decision; flattened to a dict only for API responses.
+    text and short are formatted from their templates on first access, so
+    explanations that are never displayed never pay for rendering.
+    """
+    type: str
+    text_template: str
+    short_template: str
+    fields: Dict[str, Any]
+    details: Dict[str, Any] = field(default_factory=dict)
+    _text: Optional[str] = field(default=None, repr=False, compare=False)
+    _short: Optional[str] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.text_template.format_map(self.fields)
+        return self._text
+    
+    @property
+    def short(self) -> str:
+        if self._short is None:
+            self._short = self.short_template.format_map(self.fields)
+        return self._short
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict form consumed by the dashboard decision log"""
+        return {"type": self.type, **self.details, "text": self.text, "short": self.short}
+
 
 class DecisionExplainer:
     """
     Generates natural language explanations for system decisions.
     Uses clinical terminology appropriate for healthcare professionals.
     Provides transparency and audit trail for medical decision support.
+    Only the most recent max_explanations entries are retained.
     """
     
-    def __init__(self):
-        self.explanations: List[Dict] = []
+    def __init__(self, max_explanations: int = MAX_EXPLANATIONS):
+        self._max_explanations = max_explanations
+        self.explanations: deque = deque(maxlen=max_explanations)
+        # Same explanations bucketed by type, oldest first, for per-type queries
+        self._by_type: Dict[str, deque] = defaultdict(deque)
     
     def reset(self):
         """Reset explanations for new simulation"""
-        self.explanations = []
+        self.explanations = deque(maxlen=self._max_explanations)
+        self._by_type = defaultdict(deque)
+    
+    def _record(self, explanation: Explanation) -> None:
+        """Append to the log and its type bucket, evicting the oldest entry from both"""
+        if len(self.explanations) == self._max_explanations:
+            if not self.explanations:
+                # max_explanations=0: keep nothing, including the type buckets
+                return
+            self._by_type[self.explanations[0].type].popleft()
+        self.explanations.append(explanation)
+        self._by_type[explanation.type].append(explanation)
     
     def _get_esi_description(self, severity_or_esi) -> str:
         """Get ESI triage category description"""
         if isinstance(severity_or_esi, int):
-            esi = severity_or_esi
-        else:
-            esi = SEVERITY_TO_ESI.get(severity_or_esi, 3)
-        return f"ESI-{esi} ({ESI_LEVELS[esi]['name']})"
+            return _ESI_DESC[severity_or_esi]
+        return _ESI_DESC[SEVERITY_TO_ESI.get(severity_or_esi, 3)]
     
     def explain_patient_assignment(
         self,
@@ -39,7 +212,7 @@ class DecisionExplainer:
         capacity_available: int,
         alternative_hospitals: List[str] = None,
         esi_level: int = None,
-    ) -> Dict[str, Any]:
+    ) -> Explanation:
         """Explain why a patient was assigned to a specific hospital using clinical terminology"""
         
         esi = esi_level or SEVERITY_TO_ESI.get(patient_severity, 3)
@@ -48,20 +221,12 @@ class DecisionExplainer:
         reasons = []
         
         # Clinical distance reasoning
-        if distance < 10:
-            reasons.append(f"nearest definitive care facility ({round(distance, 1)}km)")
-        elif distance < 25:
-            reasons.append(f"accessible facility within response radius ({round(distance, 1)}km)")
-        else:
-            reasons.append(f"available capacity despite distance ({round(distance, 1)}km)")
+        reasons.append(_DISTANCE_REASONS[bisect_right(_DISTANCE_LIMITS, distance)].format(distance))
         
         # Capacity reasoning with clinical context
-        if capacity_available > 20:
-            reasons.append(f"adequate bed availability ({capacity_available} beds)")
-        elif capacity_available > 5:
-            reasons.append(f"sufficient capacity to ensure safe admission ({capacity_available} beds)")
-        else:
-            reasons.append("limited but available capacity")
+        reasons.append(
+            _CAPACITY_REASONS[bisect_left(_CAPACITY_LIMITS, capacity_available)].format(capacity_available)
+        )
         
         # ESI-specific reasoning
         if esi <= 2:
@@ -69,25 +234,27 @@ class DecisionExplainer:
         
         # Alternative consideration
         if alternative_hospitals:
-            reasons.append(f"optimal choice among {len(alternative_hospitals)} assessed facilities")
-        
-        explanation_text = (
-            f"Patient {patient_id} ({triage_desc}) transferred to {hospital_name}. "
-            f"Clinical rationale: {'; '.join(reasons)}."
+            reasons.append(_ALTERNATIVES.format(len(alternative_hospitals)))
+        
+        explanation = Explanation(
+            type="patient_assignment",
+            text_template=_ASSIGN_TEXT,
+            short_template=_ASSIGN_SHORT,
+            fields={
+                "pid": patient_id,
+                "triage": triage_desc,
+                "hospital": hospital_name,
+                "reasons": "; ".join(reasons),
+            },
+            details={
+                "patient_id": patient_id,
+                "esi_level": esi,
+                "triage_category": _ESI_NAME[esi],
+                "hospital": assigned_hospital,
+            },
         )
         
-        explanation = {
-            "type": "patient_assignment",
-            "patient_id": patient_id,
-            "esi_level": esi,
-            "triage_category": ESI_LEVELS[esi]["name"],
-            "hospital": assigned_hospital,
-            "text": explanation_text,
-            "explanation": explanation_text,
-            "short": f"Patient {patient_id} ({triage_desc}) → {hospital_name}",
-        }
-        
-        self.explanations.append(explanation)
+        self._record(explanation)
         return explanation
     
     def explain_reroute(
@@ -97,38 +264,31 @@ class DecisionExplainer:
         to_hospital: str,
         reason: str,
         esi_level: int = None,
-    ) -> Dict[str, Any]:
+    ) -> Explanation:
         """Explain patient diversion using clinical terminology"""
         
-        reason_map = {
-            "overload": "surge protocol activated at original destination",
-            "oxygen_shortage": "oxygen reserves insufficient for safe care delivery",
-            "icu_full": "critical care saturation at original facility",
-            "faster_delivery": "alternative pathway reduces time to definitive care",
-            "load_balancing": "regional load distribution to maintain system capacity",
-            "diversion": "mandatory patient diversion per facility status",
-        }
-        
-        clinical_reason = reason_map.get(reason, reason)
+        clinical_reason = _REASON_MAP.get(reason, reason)
         triage_desc = self._get_esi_description(esi_level) if esi_level else ""
         
-        explanation_text = (
-            f"Patient diversion approved: {patient_id} {triage_desc} "
-            f"redirected from {from_hospital} to {to_hospital}. "
-            f"Clinical rationale: {clinical_reason}."
+        explanation = Explanation(
+            type="patient_diversion",
+            text_template=_REROUTE_TEXT,
+            short_template=_REROUTE_SHORT,
+            fields={
+                "pid": patient_id,
+                "triage": triage_desc,
+                "src": from_hospital,
+                "dst": to_hospital,
+                "reason": clinical_reason,
+            },
+            details={
+                "patient_id": patient_id,
+                "from": from_hospital,
+                "to": to_hospital,
+            },
         )
         
-        explanation = {
-            "type": "patient_diversion",
-            "patient_id": patient_id,
-            "from": from_hospital,
-            "to": to_hospital,
-            "text": explanation_text,
-            "explanation": explanation_text,
-            "short": f"Patient diversion: {patient_id} → {to_hospital}",
-        }
-        
-        self.explanations.append(explanation)
+        self._record(explanation)
         return explanation
     
     def explain_supply_allocation(
@@ -140,48 +300,38 @@ class DecisionExplainer:
         urgency: str,
         reason: str = "",
         hours_remaining: float = None,
-    ) -> Dict[str, Any]:
+    ) -> Explanation:
         """Explain supply allocation using clinical terminology"""
         
-        urgency_text = {
-            "critical": "emergent resupply",
-            "high": "priority resupply",
-            "medium": "scheduled resupply",
-            "low": "routine restocking",
-        }
-        
-        supply_descriptions = {
-            "oxygen": "medical oxygen",
-            "blood_products": "blood products",
-            "medications": "essential medications",
-            "ppe": "personal protective equipment",
-            "iv_fluids": "IV fluids",
-        }
-        
-        supply_desc = supply_descriptions.get(supply_type, supply_type)
-        urgency_desc = urgency_text.get(urgency, urgency)
+        supply_desc = _SUPPLY_DESC.get(supply_type, supply_type)
+        urgency_desc = _URGENCY_TEXT.get(urgency, urgency)
         
         hours_context = ""
         if hours_remaining is not None:
-            hours_context = f" Current reserve: ≈{round(hours_remaining, 1)} hours at current consumption."
-        
-        explanation_text = (
-            f"{supply_desc.capitalize()} reallocation: {quantity} units dispatched to {to_hospital} "
-            f"({urgency_desc}).{hours_context} {reason}".strip()
+            hours_context = _SUPPLY_HOURS.format(hours_remaining)
+        
+        explanation = Explanation(
+            type="supply_allocation",
+            text_template=_SUPPLY_TEXT,
+            short_template=_SUPPLY_SHORT,
+            fields={
+                "supply_title": supply_desc.capitalize(),
+                "supply": supply_desc,
+                "qty": quantity,
+                "hospital": to_hospital,
+                "urgency": urgency_desc,
+                # Optional trailing sentences; no dangling space when reason is empty
+                "tail": f"{hours_context} {reason}".rstrip(),
+            },
+            details={
+                "supply": supply_type,
+                "quantity": quantity,
+                "destination": to_hospital,
+                "urgency": urgency,
+            },
         )
         
-        explanation = {
-            "type": "supply_allocation",
-            "supply": supply_type,
-            "quantity": quantity,
-            "destination": to_hospital,
-            "urgency": urgency,
-            "text": explanation_text,
-            "explanation": explanation_text,
-            "short": f"Supply dispatch: {quantity} {supply_desc} → {to_hospital}",
-        }
-        
-        self.explanations.append(explanation)
+        self._record(explanation)
         return explanation
     
     def explain_ambulance_dispatch(
@@ -192,39 +342,42 @@ class DecisionExplainer:
         eta_minutes: float,
         distance: float = None,
         esi_level: int = None,
-    ) -> Dict[str, Any]:
+    ) -> Explanation:
         """Explain ambulance dispatch decision using clinical terminology"""
         
-        eta_text = f"ETA: {round(eta_minutes)} minutes"
-        if distance:
-            eta_text += f" ({round(distance, 1)}km)"
+        distance_text = _DISPATCH_DISTANCE.format(distance) if distance else ""
         
         triage_context = ""
         golden_hour = ""
         if esi_level:
-            triage_context = f" for {self._get_esi_description(esi_level)} patient"
+            triage_context = _DISPATCH_TRIAGE.format(self._get_esi_description(esi_level))
             if esi_level <= 2 and eta_minutes < 60:
                 golden_hour = " Golden hour compliance maintained."
             elif esi_level <= 2:
                 golden_hour = " Extended transport time documented."
         
-        explanation_text = (
-            f"Ambulance unit {ambulance_id} deployed{triage_context} to {hospital_id}. "
-            f"{eta_text}.{golden_hour}"
+        explanation = Explanation(
+            type="ambulance_dispatch",
+            text_template=_DISPATCH_TEXT,
+            short_template=_DISPATCH_SHORT,
+            fields={
+                "amb": ambulance_id,
+                "pid": patient_id,
+                "triage": triage_context,
+                "hospital": hospital_id,
+                "eta": eta_minutes,
+                "distance": distance_text,
+                "golden": golden_hour,
+            },
+            details={
+                "ambulance": ambulance_id,
+                "patient": patient_id,
+                "hospital": hospital_id,
+                "eta_minutes": eta_minutes,
+            },
         )
         
-        explanation = {
-            "type": "ambulance_dispatch",
-            "ambulance": ambulance_id,
-            "patient": patient_id,
-            "hospital": hospital_id,
-            "eta_minutes": eta_minutes,
-            "text": explanation_text,
-            "explanation": explanation_text,
-            "short": f"Ambulance {ambulance_id} dispatched: {patient_id} → {hospital_id} ({round(eta_minutes)}min)",
-        }
-        
-        self.explanations.append(explanation)
+        self._record(explanation)
         return explanation
     
     def explain_surge_activation(
@@ -233,37 +386,26 @@ class DecisionExplainer:
         hospital_name: str,
         trigger: str,
         actions: List[str] = None,
-    ) -> Dict[str, Any]:
+    ) -> Explanation:
         """Explain surge protocol activation"""
         
-        trigger_descriptions = {
-            "bed_capacity": "bed utilization exceeded surge threshold",
-            "icu_saturation": "critical care saturation detected",
-            "oxygen_shortage": "oxygen reserves below safe operating threshold",
-            "staffing": "staffing ratios below clinical standards",
-            "mass_casualty": "mass-casualty incident declared",
-        }
-        
-        trigger_desc = trigger_descriptions.get(trigger, trigger)
+        trigger_desc = _TRIGGER_DESC.get(trigger, trigger)
         actions_text = ""
         if actions:
-            actions_text = f" Actions initiated: {'; '.join(actions)}."
-        
-        explanation_text = (
-            f"Surge protocol activated at {hospital_name}. "
-            f"Trigger: {trigger_desc}.{actions_text}"
+            actions_text = _SURGE_ACTIONS.format("; ".join(actions))
+        
+        explanation = Explanation(
+            type="surge_activation",
+            text_template=_SURGE_TEXT,
+            short_template=_SURGE_SHORT,
+            fields={"hospital": hospital_name, "trigger": trigger_desc, "actions": actions_text},
+            details={
+                "hospital": hospital_id,
+                "trigger": trigger,
+            },
         )
         
-        explanation = {
-            "type": "surge_activation",
-            "hospital": hospital_id,
-            "trigger": trigger,
-            "text": explanation_text,
-            "explanation": explanation_text,
-            "short": f"Surge protocol: {hospital_name}",
-        }
-        
-        self.explanations.append(explanation)
+        self._record(explanation)
         return explanation
     
     def explain_overload_prevention(
@@ -272,35 +414,26 @@ class DecisionExplainer:
         hospital_name: str,
         action_taken: str,
         patients_redirected: int = 0,
-    ) -> Dict[str, Any]:
+    ) -> Explanation:
         """Explain how facility overload was prevented"""
         
-        actions = {
-            "redirect": f"{patients_redirected} patients diverted to alternate facilities",
-            "supply_boost": "emergent medical supplies dispatched",
-            "capacity_expansion": "surge capacity resources activated",
-            "load_balance": "regional patient distribution rebalanced",
-            "diversion_order": "patient diversion order issued",
-        }
-        
-        action_desc = actions.get(action_taken, action_taken)
-        
-        explanation_text = (
-            f"Facility overload prevented at {hospital_name}. "
-            f"Intervention: {action_desc}. "
-            f"Continuity of care maintained."
+        if action_taken == "redirect":
+            action_desc = _OVERLOAD_REDIRECT.format(patients_redirected)
+        else:
+            action_desc = _OVERLOAD_ACTIONS.get(action_taken, action_taken)
+        
+        explanation = Explanation(
+            type="overload_prevention",
+            text_template=_OVERLOAD_TEXT,
+            short_template=_OVERLOAD_SHORT,
+            fields={"hospital": hospital_name, "action": action_desc},
+            details={
+                "hospital": hospital_id,
+                "action": action_taken,
+            },
         )
         
-        explanation = {
-            "type": "overload_prevention",
-            "hospital": hospital_id,
-            "action": action_taken,
-            "text": explanation_text,
-            "explanation": explanation_text,
-            "short": f"Overload prevented: {hospital_name}",
-        }
-        
-        self.explanations.append(explanation)
+        self._record(explanation)
         return explanation
     
     def explain_government_override(
@@ -308,34 +441,23 @@ class DecisionExplainer:
         override_type: str,
         target: str,
         directive: str,
-    ) -> Dict[str, Any]:
+    ) -> Explanation:
         """Explain regional authority directive"""
         
-        override_descriptions = {
-            "priority_escalation": "Regional priority escalation",
-            "resource_reallocation": "Resource reallocation directive",
-            "facility_designation": "Facility designation order",
-            "surge_declaration": "Regional surge declaration",
-            "mutual_aid": "Mutual aid activation",
-        }
-        
-        type_desc = override_descriptions.get(override_type, override_type)
-        
-        explanation_text = (
-            f"Regional authority directive: {type_desc} affecting {target}. "
-            f"Directive: {directive}"
+        type_desc = _OVERRIDE_DESC.get(override_type, override_type)
+        
+        explanation = Explanation(
+            type="government_override",
+            text_template=_OVERRIDE_TEXT,
+            short_template=_OVERRIDE_SHORT,
+            fields={"kind": type_desc, "target": target, "directive": directive},
+            details={
+                "override_type": override_type,
+                "target": target,
+            },
         )
         
-        explanation = {
-            "type": "government_override",
-            "override_type": override_type,
-            "target": target,
-            "text": explanation_text,
-            "explanation": explanation_text,
-            "short": f"Authority directive: {type_desc}",
-        }
-        
-        self.explanations.append(explanation)
+        self._record(explanation)
         return explanation
     
     def explain_icu_escalation(
@@ -343,61 +465,45 @@ class DecisionExplainer:
         region: str,
         available_icu: int,
         action: str,
-    ) -> Dict[str, Any]:
+    ) -> Explanation:
         """Explain ICU capacity escalation to regional authority"""
         
-        explanation_text = (
-            f"No ICU capacity available within {region}. "
-            f"System-wide ICU availability: {available_icu} beds. "
-            f"Escalation initiated: {action}."
+        explanation = Explanation(
+            type="icu_escalation",
+            text_template=_ICU_TEXT,
+            short_template=_ICU_SHORT,
+            fields={"region": region, "icu": available_icu, "action": action},
+            details={
+                "region": region,
+                "available_icu": available_icu,
+            },
         )
         
-        explanation = {
-            "type": "icu_escalation",
-            "region": region,
-            "available_icu": available_icu,
-            "text": explanation_text,
-            "explanation": explanation_text,
-            "short": f"ICU escalation: {region} ({available_icu} beds available)",
-        }
-        
-        self.explanations.append(explanation)
+        self._record(explanation)
         return explanation
     
     def get_recent_explanations(self, limit: int = 20) -> List[Dict]:
         """Get recent explanations for decision log"""
-        return self.explanations[-limit:]
+        # Walk back from the newest entry so the cost is O(limit), not O(len);
+        # negative limits are clamped to 0 rather than passed to islice
+        recent = [e.to_dict() for e in islice(reversed(self.explanations), max(limit, 0))]
+        recent.reverse()
+        return recent
     
     def get_explanations_by_type(self, exp_type: str) -> List[Dict]:
         """Get explanations filtered by type"""
-        return [e for e in self.explanations if e.get("type") == exp_type]
+        return [e.to_dict() for e in self._by_type.get(exp_type, ())]
     
     def generate_summary(self) -> str:
         """Generate a clinical summary of recent system actions"""
         if not self.explanations:
             return "System monitoring active. No interventions required."
         
-        recent = self.explanations[-10:]
-        
-        counts = {}
-        for exp in recent:
-            exp_type = exp.get("type", "other")
-            counts[exp_type] = counts.get(exp_type, 0) + 1
-        
-        parts = []
-        if counts.get("patient_assignment", 0):
-            parts.append(f"{counts['patient_assignment']} patient transfer(s)")
-        if counts.get("patient_diversion", 0) or counts.get("reroute", 0):
-            diverts = counts.get("patient_diversion", 0) + counts.get("reroute", 0)
-            parts.append(f"{diverts} patient diversion(s)")
-        if counts.get("supply_allocation", 0):
-            parts.append(f"{counts['supply_allocation']} supply dispatch(es)")
-        if counts.get("overload_prevention", 0):
-            parts.append(f"{counts['overload_prevention']} overload intervention(s)")
-        if counts.get("surge_activation", 0):
-            parts.append(f"{counts['surge_activation']} surge activation(s)")
-        if counts.get("ambulance_dispatch", 0):
-            parts.append(f"{counts['ambulance_dispatch']} ambulance deployment(s)")
+        counts = Counter(exp.type for exp in islice(reversed(self.explanations), 10))
+        # Legacy "reroute" entries count as diversions
+        counts["patient_diversion"] += counts.pop("reroute", 0)
+        
+        parts = [f"{n} {label}" for exp_type, label in _SUMMARY_LABELS if (n := counts[exp_type])]
         
         if parts:
             return "Recent system actions: " + ", ".join(parts) + "."
@@ -3,10 +3,13 @@ Failure Handler: Handles worst-case scenarios gracefully
 Prevents demo collapse and ensures system resilience
 """
 
+import sys
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from enum import Enum
 
+from ..state.agent_states import HospitalState, AmbulanceState
+
 
 class FailureType(str, Enum):
     NO_BEDS_ANYWHERE = "no_beds_anywhere"
@@ -17,6 +20,84 @@ class FailureType(str, Enum):
     SYSTEM_OVERLOAD = "system_overload"
 
 
+# Emergency protocol for each failure type value; shared by all handlers, never mutated
+_EMERGENCY_PROTOCOLS: Dict[str, Dict] = {
+    FailureType.NO_BEDS_ANYWHERE.value: {
+        "name": "Emergency Bed Expansion Protocol",
+        "actions": [
+            "Activate overflow capacity at all hospitals",
+            "Request field hospital deployment",
+            "Prioritize critical patients only",
+            "Implement triage protocols",
+        ],
+        "severity": "critical",
+    },
+    FailureType.OXYGEN_EXHAUSTED.value: {
+        "name": "Oxygen Emergency Protocol",
+        "actions": [
+            "Redistribute from lower-priority facilities",
+            "Emergency airlift request",
+            "Implement oxygen rationing",
+            "Prioritize ICU patients",
+        ],
+        "severity": "critical",
+    },
+    FailureType.NO_AMBULANCES.value: {
+        "name": "Transport Emergency Protocol",
+        "actions": [
+            "Activate reserve vehicles",
+            "Request military/police transport",
+            "Establish triage collection points",
+            "Priority-based patient staging",
+        ],
+        "severity": "high",
+    },
+    FailureType.SUPPLY_DEPLETED.value: {
+        "name": "Supply Chain Emergency Protocol",
+        "actions": [
+            "Emergency procurement activated",
+            "Regional supply sharing initiated",
+            "Non-essential deliveries suspended",
+            "Rationing protocols in effect",
+        ],
+        "severity": "high",
+    },
+    FailureType.COMMUNICATION_FAILURE.value: {
+        "name": "Communication Backup Protocol",
+        "actions": [
+            "Switch to backup channels",
+            "Activate radio networks",
+            "Deploy communication officers",
+            "Implement local decision authority",
+        ],
+        "severity": "medium",
+    },
+    FailureType.SYSTEM_OVERLOAD.value: {
+        "name": "System Overload Protocol",
+        "actions": [
+            "Reduce update frequency",
+            "Prioritize critical operations",
+            "Queue non-urgent requests",
+            "Scale processing capacity",
+        ],
+        "severity": "medium",
+    },
+}
+
+# Protocol names are copied into every handled failure record; share one object each
+for _protocol in _EMERGENCY_PROTOCOLS.values():
+    _protocol["name"] = sys.intern(_protocol["name"])
+
+
+# Prebuilt "icon SEVERITY: " alert prefix per failure severity; others get the medium icon
+_ALERT_PREFIX = {
+    "critical": "🔴 CRITICAL: ",
+    "high": "🟠 HIGH: ",
+    "medium": "🟡 MEDIUM: ",
+}
+_DEFAULT_ICON = "🟡"
+
+
 class FailureHandler:
     """
     Handles worst-case scenarios with graceful degradation.
@@ -24,116 +105,56 @@ class FailureHandler:
     """
     
     def __init__(self):
-        self.active_failures: List[Dict] = []
+        # At most one active failure per type, keyed by type for O(1) dedup and resolve
+        self.active_failures: Dict[str, Dict] = {}
         self.failure_history: List[Dict] = []
-        self.emergency_protocols: Dict[FailureType, Dict] = self._init_protocols()
+        self.emergency_protocols: Dict[str, Dict] = _EMERGENCY_PROTOCOLS
     
-    def _init_protocols(self) -> Dict[FailureType, Dict]:
-        """Initialize emergency protocols for each failure type"""
-        return {
-            FailureType.NO_BEDS_ANYWHERE: {
-                "name": "Emergency Bed Expansion Protocol",
-                "actions": [
-                    "Activate overflow capacity at all hospitals",
-                    "Request field hospital deployment",
-                    "Prioritize critical patients only",
-                    "Implement triage protocols",
-                ],
-                "severity": "critical",
-            },
-            FailureType.OXYGEN_EXHAUSTED: {
-                "name": "Oxygen Emergency Protocol",
-                "actions": [
-                    "Redistribute from lower-priority facilities",
-                    "Emergency airlift request",
-                    "Implement oxygen rationing",
-                    "Prioritize ICU patients",
-                ],
-                "severity": "critical",
-            },
-            FailureType.NO_AMBULANCES: {
-                "name": "Transport Emergency Protocol",
-                "actions": [
-                    "Activate reserve vehicles",
-                    "Request military/police transport",
-                    "Establish triage collection points",
-                    "Priority-based patient staging",
-                ],
-                "severity": "high",
-            },
-            FailureType.SUPPLY_DEPLETED: {
-                "name": "Supply Chain Emergency Protocol",
-                "actions": [
-                    "Emergency procurement activated",
-                    "Regional supply sharing initiated",
-                    "Non-essential deliveries suspended",
-                    "Rationing protocols in effect",
-                ],
-                "severity": "high",
-            },
-            FailureType.COMMUNICATION_FAILURE: {
-                "name": "Communication Backup Protocol",
-                "actions": [
-                    "Switch to backup channels",
-                    "Activate radio networks",
-                    "Deploy communication officers",
-                    "Implement local decision authority",
-                ],
-                "severity": "medium",
-            },
-            FailureType.SYSTEM_OVERLOAD: {
-                "name": "System Overload Protocol",
-                "actions": [
-                    "Reduce update frequency",
-                    "Prioritize critical operations",
-                    "Queue non-urgent requests",
-                    "Scale processing capacity",
-                ],
-                "severity": "medium",
-            },
-        }
+    def reset(self):
+        """Clear failures for a new simulation (protocols are static)"""
+        self.active_failures = {}
+        self.failure_history = []
     
     def detect_failures(
         self,
-        hospitals: Dict[str, Dict],
-        ambulances: Dict[str, Dict],
+        hospitals: Dict[str, HospitalState],
+        ambulances: Dict[str, AmbulanceState],
         supply: Dict,
     ) -> List[Dict]:
         """Detect current failure conditions"""
         detected = []
         
-        # Check for no beds anywhere
-        total_beds = sum(h.get("available_beds", 0) for h in hospitals.values())
-        total_icu = sum(h.get("icu_available", 0) for h in hospitals.values())
+        # Bed, ICU and oxygen aggregates in one pass over the hospitals
+        total_beds = 0
+        total_icu = 0
+        hospitals_without_oxygen = []
+        for h_id, h in hospitals.items():
+            total_beds += h.available_beds
+            total_icu += h.icu_available
+            if h.oxygen_units <= 5:
+                hospitals_without_oxygen.append(h_id)
         
+        # Check for no beds anywhere
         if total_beds == 0 and total_icu == 0:
             detected.append({
-                "type": FailureType.NO_BEDS_ANYWHERE,
+                "type": FailureType.NO_BEDS_ANYWHERE.value,
                 "severity": "critical",
                 "details": "All hospitals at maximum capacity",
             })
         
-        # Check for oxygen exhaustion
-        hospitals_without_oxygen = [
-            h_id for h_id, h in hospitals.items()
-            if h.get("oxygen_units", 0) <= 5
-        ]
-        if len(hospitals_without_oxygen) >= len(hospitals) * 0.5:
+        # Check for oxygen exhaustion (at least half the hospitals)
+        if 2 * len(hospitals_without_oxygen) >= len(hospitals):
             detected.append({
-                "type": FailureType.OXYGEN_EXHAUSTED,
+                "type": FailureType.OXYGEN_EXHAUSTED.value,
                 "severity": "critical",
                 "details": f"{len(hospitals_without_oxygen)} hospitals critically low on oxygen",
                 "affected": hospitals_without_oxygen,
             })
         
-        # Check for no ambulances
-        available_ambulances = [
-            a_id for a_id, a in ambulances.items()
-            if a.get("available") and a.get("fuel", 0) > 15
-        ]
-        if len(available_ambulances) == 0:
+        # Check for no ambulances (stops at the first dispatchable unit)
+        if not any(a.available and a.fuel > 15 for a in ambulances.values()):
             detected.append({
-                "type": FailureType.NO_AMBULANCES,
+                "type": FailureType.NO_AMBULANCES.value,
                 "severity": "high",
                 "details": "No ambulances available for dispatch",
             })
@@ -144,7 +165,7 @@ class FailureHandler:
         depleted = [s for s in critical_supplies if inventory.get(s, 0) <= 10]
         if depleted:
             detected.append({
-                "type": FailureType.SUPPLY_DEPLETED,
+                "type": FailureType.SUPPLY_DEPLETED.value,
                 "severity": "high",
                 "details": f"Critical supplies depleted: {', '.join(depleted)}",
                 "affected": depleted,
@@ -152,71 +173,72 @@ class FailureHandler:
         
         return detected
     
-    def handle_failure(self, failure: Dict) -> Dict[str, Any]:
-        """Handle a detected failure with appropriate protocol"""
+    def handle_failure(self, failure: Dict, ts: Optional[str] = None) -> Dict[str, Any]:
+        """Handle a detected failure with appropriate protocol. Pass ts to reuse a timestamp already taken"""
         failure_type = failure.get("type")
+        # detect_failures already emits plain strings; unwrap a FailureType passed by other callers
+        if isinstance(failure_type, FailureType):
+            failure_type = failure["type"] = failure_type.value
         protocol = self.emergency_protocols.get(failure_type, {})
+        ts = ts or datetime.now().isoformat()
         
         response = {
             "failure": failure,
             "protocol": protocol.get("name", "Emergency Response"),
             "actions_taken": protocol.get("actions", ["Manual intervention required"]),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts,
             "status": "activated",
         }
         
         # Add to active failures
-        self.active_failures.append({
+        self.active_failures[failure_type] = {
             **failure,
-            "handled_at": datetime.now().isoformat(),
+            "handled_at": ts,
             "protocol": protocol.get("name"),
-        })
+        }
         
         return response
     
     def check_and_handle_failures(
         self,
-        hospitals: Dict[str, Dict],
-        ambulances: Dict[str, Dict],
+        hospitals: Dict[str, HospitalState],
+        ambulances: Dict[str, AmbulanceState],
         supply: Dict,
+        ts: Optional[str] = None,
     ) -> List[Dict]:
-        """Detect and handle all current failures"""
+        """Detect and handle all current failures, stamping them all with one timestamp"""
         failures = self.detect_failures(hospitals, ambulances, supply)
         responses = []
+        if failures:
+            ts = ts or datetime.now().isoformat()
         
         for failure in failures:
             # Check if already being handled
-            already_active = any(
-                f.get("type") == failure.get("type")
-                for f in self.active_failures
-            )
-            
-            if not already_active:
-                response = self.handle_failure(failure)
+            if failure.get("type") not in self.active_failures:
+                response = self.handle_failure(failure, ts)
                 responses.append(response)
         
         return responses
     
-    def resolve_failure(self, failure_type: FailureType) -> bool:
+    def resolve_failure(self, failure_type: str) -> bool:
         """Mark a failure as resolved"""
-        for failure in self.active_failures:
-            if failure.get("type") == failure_type:
-                failure["resolved_at"] = datetime.now().isoformat()
-                self.failure_history.append(failure)
-                self.active_failures.remove(failure)
-                return True
-        return False
+        failure = self.active_failures.pop(failure_type, None)
+        if failure is None:
+            return False
+        failure["resolved_at"] = datetime.now().isoformat()
+        self.failure_history.append(failure)
+        return True
     
     def get_active_failures(self) -> List[Dict]:
         """Get list of active failures"""
-        return self.active_failures.copy()
+        return list(self.active_failures.values())
     
     def get_failure_summary(self) -> Dict[str, Any]:
         """Get summary for dashboard"""
         return {
             "active_failures": len(self.active_failures),
             "critical_count": sum(
-                1 for f in self.active_failures 
+                1 for f in self.active_failures.values()
                 if f.get("severity") == "critical"
             ),
             "failures": [
@@ -226,7 +248,7 @@ class FailureHandler:
                     "protocol": f.get("protocol"),
                     "details": f.get("details"),
                 }
-                for f in self.active_failures
+                for f in self.active_failures.values()
             ],
             "total_handled": len(self.failure_history),
         }
@@ -234,14 +256,16 @@ class FailureHandler:
     def generate_failure_alert(self, failure: Dict) -> str:
         """Generate alert message for dashboard"""
         failure_type = failure.get("type", "unknown")
+        # str() of a FailureType renders the member name, so unwrap it to the value
+        if isinstance(failure_type, FailureType):
+            failure_type = failure_type.value
         severity = failure.get("severity", "unknown")
         details = failure.get("details", "")
         protocol = self.emergency_protocols.get(failure_type, {})
-        
-        icon = "🔴" if severity == "critical" else "🟠" if severity == "high" else "🟡"
+        prefix = _ALERT_PREFIX.get(severity) or f"{_DEFAULT_ICON} {severity.upper()}: "
         
         return (
-            f"{icon} {severity.upper()}: {failure_type.value if hasattr(failure_type, 'value') else failure_type}\n"
-            f"   {details}\n"
-            f"   Protocol: {protocol.get('name', 'Emergency Response')}"
+            prefix + str(failure_type)
+            + "\n   " + str(details)
+            + "\n   Protocol: " + protocol.get("name", "Emergency Response")
         )
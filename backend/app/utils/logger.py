@@ -3,31 +3,264 @@ Simulation Logger: Timeline logging with replay capability
 Enables "Here's the exact sequence of decisions" flex
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, BinaryIO, Callable, Iterable, Tuple, FrozenSet
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
+import gzip
+import heapq
+import io
 import json
+import sys
+import time
+
+try:
+    import orjson
+except ImportError:  # optional; export_json falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional; only needed for export_compressed(codec="zstd")
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:  # optional; only needed for the msgpack archive format
+    msgpack = None
+
+# Events kept in memory; older ones are evicted (and spilled, if configured) first
+MAX_EVENTS = 100_000
+
+# Logged events are buffered and applied to the columns/indexes in batches of at most this many
+FLUSH_BATCH_SIZE = 1024
+
+# Default for set_window's spill_path meaning "keep the current spill path"
+_KEEP_SPILL_PATH = object()
+
+# Initial row capacity of the typed columns; doubled whenever a flush would overflow it
+INITIAL_CAPACITY = 4096
+
+# Replay line per (category, event type); a None type matches any type in the category
+_REPLAY_FORMATTERS: Dict[Tuple[str, Optional[str]], Callable[[int, Dict], str]] = {
+    ("allocation", "patient_assigned"): lambda tick, d: (
+        f"[Tick {tick}] Patient {d['patient_id']} ({d['severity']}) → {d['hospital_id']}"
+    ),
+    ("dispatch", None): lambda tick, d: (
+        f"[Tick {tick}] 🚑 {d['ambulance_id']} dispatched for {d['patient_id']} (ETA: {d['eta_minutes']}min)"
+    ),
+    ("prevention", None): lambda tick, d: f"[Tick {tick}] ⚠️ Overload prevented at {d['hospital_id']}",
+    ("supply", None): lambda tick, d: (
+        f"[Tick {tick}] 📦 {d['quantity']} {d['supply_type']} → {d['destination']}"
+    ),
+}
+_REPLAY_CATEGORIES = tuple(dict.fromkeys(category for category, _ in _REPLAY_FORMATTERS))
+
+
+def _compress(raw: bytes, codec: Optional[str]) -> bytes:
+    """Compress an archive with gzip (fastest level), zstd, or not at all (None)"""
+    if codec is None:
+        return raw
+    if codec == "gzip":
+        return gzip.compress(raw, compresslevel=1)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd export requires the zstandard package")
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def _decompress(blob: bytes, codec: Optional[str]) -> bytes:
+    """Inverse of _compress"""
+    if codec is None:
+        return blob
+    if codec == "gzip":
+        return gzip.decompress(blob)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd import requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+@dataclass(slots=True)
+class LogEvent:
+    """
+    A single logged event as handed back by log_event; flattened to a dict only when needed.
+    Carries no id: an event's id is its log position, added when rows are materialized.
+    """
+    tick: int
+    elapsed_ms: int
+    category: str
+    type: str
+    agent_id: Optional[str]
+    data: Dict[str, Any]
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Query-method shape minus the positional id; agent_id is omitted when None"""
+        event = {
+            "tick": self.tick,
+            "elapsed_ms": self.elapsed_ms,
+            "category": self.category,
+            "type": self.type,
+        }
+        if self.agent_id is not None:
+            event["agent_id"] = self.agent_id
+        event["data"] = self.data
+        return event
 
 
 class SimulationLogger:
     """
     Logs all simulation events for timeline replay.
     Provides the ability to show exact decision sequences.
+    Events are stored column-wise (one array/list per field) and only
+    assembled into dicts when queried or exported.
+    Only the most recent max_events are retained; evicted events can be
+    appended to an NDJSON spill file so nothing is lost.
+    log_event only buffers; buffered events are applied in one batch at the
+    end of each tick, when the buffer fills, or before any read.
+    Subscribers receive each applied batch, filtered to the categories and
+    agents they asked for.
     """
     
-    def __init__(self):
-        self.events: List[Dict] = []
+    def __init__(self, max_events: int = MAX_EVENTS, spill_path: Optional[str] = None):
+        self._max_events = max_events
+        self._spill_path = spill_path
+        # (categories, agents, callback); a None filter matches everything. Kept across resets
+        self._subscribers: List[Tuple[Optional[FrozenSet], Optional[FrozenSet], Callable]] = []
+        self._clear_columns()
         self.start_time: Optional[datetime] = None
         self.current_tick: int = 0
+        # Monotonic start plus the matching wall clock; event times derive from both
+        self._start_ns: Optional[int] = None
+        self._wall_start_ns: Optional[int] = None
     
     def reset(self):
         """Reset logger for new simulation"""
-        self.events = []
+        self.flush()
+        self._compact()
+        self._clear_columns()
         self.start_time = None
         self.current_tick = 0
+        self._start_ns = None
+        self._wall_start_ns = None
+    
+    def _clear_columns(self):
+        """Empty the per-field event columns; row i across them is event _offset + i"""
+        # Id of the oldest event still physically stored (earlier ones were compacted away)
+        self._offset = 0
+        # Rows in use; the typed columns are preallocated to _capacity and only [:_n] is valid
+        self._n = 0
+        self._capacity = INITIAL_CAPACITY
+        self._tick = array("i", bytes(4 * INITIAL_CAPACITY))
+        self._elapsed_ms = array("q", bytes(8 * INITIAL_CAPACITY))
+        # category / type / agent_id are dictionary-encoded: per-event codes into _strings
+        self._category = array("I", bytes(4 * INITIAL_CAPACITY))
+        self._type = array("I", bytes(4 * INITIAL_CAPACITY))
+        self._agent = array("I", bytes(4 * INITIAL_CAPACITY))
+        self._strings: List[Optional[str]] = []
+        self._string_codes: Dict[Optional[str], int] = {}
+        self._data: List[Dict[str, Any]] = []
+        # Inverted indexes: tick / category / agent_id -> event ids, oldest first
+        self._by_tick: Dict[int, List[int]] = defaultdict(list)
+        self._by_category: Dict[str, List[int]] = defaultdict(list)
+        self._by_agent: Dict[Optional[str], List[int]] = defaultdict(list)
+        # Logged but not yet applied to the columns and indexes
+        self._pending: List[LogEvent] = []
+    
+    def set_window(self, max_events: int, spill_path: Optional[str] = _KEEP_SPILL_PATH) -> None:
+        """
+        Change how many events are retained and where evicted events are spilled.
+        The current spill path is kept unless one is passed; pass None to stop spilling.
+        """
+        self.flush()
+        self._max_events = max_events
+        if spill_path is not _KEEP_SPILL_PATH:
+            self._spill_path = spill_path
+        self._compact()
+    
+    def _window_start(self) -> int:
+        """Id of the oldest retained event"""
+        return max(self._offset, self._offset + self._n - self._max_events)
+    
+    def _retained_ids(self) -> range:
+        """Ids of all retained events, oldest first"""
+        return range(self._window_start(), self._offset + self._n)
+    
+    def _in_window(self, ids: List[int]) -> List[int]:
+        """Retained suffix of an ascending id list"""
+        return ids[bisect_left(ids, self._window_start()):]
+    
+    def _compact(self) -> None:
+        """Physically drop events outside the window, spilling them first if configured"""
+        drop = self._window_start() - self._offset
+        if drop <= 0:
+            return
+        if self._spill_path:
+            with open(self._spill_path, "ab") as fp:
+                for i in range(self._offset, self._offset + drop):
+                    fp.write(self._dumps_line(self._export_row(i)))
+        # Shift the live rows down in place so the typed columns keep their capacity
+        n = self._n
+        for column in (self._tick, self._elapsed_ms, self._category, self._type, self._agent):
+            column[:n - drop] = column[drop:n]
+        del self._data[:drop]
+        self._n -= drop
+        self._offset += drop
+        for index in (self._by_tick, self._by_category, self._by_agent):
+            for key in list(index):
+                ids = index[key]
+                del ids[:bisect_left(ids, self._offset)]
+                if not ids:
+                    del index[key]
+    
+    @property
+    def events(self) -> List[Dict]:
+        """All retained events as dicts, oldest first"""
+        self.flush()
+        return [self._row(i) for i in self._retained_ids()]
+    
+    def _encode(self, value: Optional[str]) -> int:
+        """Code for a category/type/agent string, adding it (interned) on first use"""
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self._strings)
+            self._strings.append(value if value is None else sys.intern(value))
+        return code
+    
+    def _encode_batch(self, values: List[Optional[str]]) -> List[int]:
+        """Codes for a batch; plain dict lookups unless the batch brings a new string"""
+        codes = self._string_codes
+        try:
+            return [codes[value] for value in values]
+        except KeyError:
+            return [self._encode(value) for value in values]
+    
+    def _row(self, event_id: int) -> Dict:
+        """Assemble an event from the columns; agent_id is omitted when None"""
+        strings = self._strings
+        i = event_id - self._offset
+        row = {
+            "id": event_id,
+            "tick": self._tick[i],
+            "elapsed_ms": self._elapsed_ms[i],
+            "category": strings[self._category[i]],
+            "type": strings[self._type[i]],
+        }
+        agent_id = strings[self._agent[i]]
+        if agent_id is not None:
+            row["agent_id"] = agent_id
+        row["data"] = self._data[i]
+        return row
     
     def start(self):
         """Start logging"""
-        self.start_time = datetime.now()
+        self._wall_start_ns = time.time_ns()
+        self._start_ns = time.perf_counter_ns()
+        self.start_time = datetime.fromtimestamp(self._wall_start_ns / 1e9)
         self.log_event("simulation", "start", {"message": "Simulation started"})
     
     def log_event(
@@ -36,29 +269,117 @@ class SimulationLogger:
         event_type: str,
         data: Dict[str, Any],
         agent_id: str = None,
-    ):
-        """Log a simulation event"""
-        event = {
-            "id": len(self.events),
-            "tick": self.current_tick,
-            "timestamp": datetime.now().isoformat(),
-            "elapsed_ms": self._get_elapsed_ms(),
-            "category": category,
-            "type": event_type,
-            "agent_id": agent_id,
-            "data": data,
-        }
-        self.events.append(event)
+    ) -> LogEvent:
+        """Log a simulation event; only elapsed_ms is stored, wall-clock time is derived on export"""
+        elapsed_ms = 0 if self._start_ns is None else (time.perf_counter_ns() - self._start_ns) // 1_000_000
+        event = LogEvent(self.current_tick, elapsed_ms, category, event_type, agent_id, data)
+        self._pending.append(event)
+        if len(self._pending) >= FLUSH_BATCH_SIZE:
+            self.flush()
         return event
     
+    def flush(self) -> None:
+        """Apply all buffered events to the columns and indexes in one batch"""
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+        start, end = self._n, self._n + len(pending)
+        first_id = self._offset + start
+        self._reserve(end)
+        self._tick[start:end] = array("i", [e.tick for e in pending])
+        self._elapsed_ms[start:end] = array("q", [e.elapsed_ms for e in pending])
+        self._category[start:end] = array("I", self._encode_batch([e.category for e in pending]))
+        self._type[start:end] = array("I", self._encode_batch([e.type for e in pending]))
+        self._agent[start:end] = array("I", self._encode_batch([e.agent_id for e in pending]))
+        self._data.extend(e.data for e in pending)
+        self._n = end
+        by_tick, by_category, by_agent = self._by_tick, self._by_category, self._by_agent
+        for event_id, e in enumerate(pending, first_id):
+            by_tick[e.tick].append(event_id)
+            by_category[e.category].append(event_id)
+            by_agent[e.agent_id].append(event_id)
+        # Evicted rows are compacted in batches of a quarter window to keep eviction amortized O(1)
+        if self._n >= self._max_events + max(self._max_events // 4, 1):
+            self._compact()
+        
+        for categories, agents, callback in self._subscribers:
+            # Only per-event checks the subscription needs; unfiltered ones get a plain copy
+            if categories is None and agents is None:
+                matched = pending[:]
+            elif agents is None:
+                matched = [e for e in pending if e.category in categories]
+            elif categories is None:
+                matched = [e for e in pending if e.agent_id in agents]
+            else:
+                matched = [e for e in pending if e.category in categories and e.agent_id in agents]
+            if matched:
+                # The batch has already left _pending, so one failing subscriber
+                # must not break the read that flushed or starve the others
+                try:
+                    callback(matched)
+                except Exception as e:
+                    print(f"Error in log subscriber callback: {e}")
+    
+    def _reserve(self, rows: int) -> None:
+        """Grow the typed columns geometrically until they hold at least rows entries"""
+        if rows <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < rows:
+            capacity *= 2
+        for column in (self._tick, self._elapsed_ms, self._category, self._type, self._agent):
+            column.frombytes(bytes(column.itemsize * (capacity - self._capacity)))
+        self._capacity = capacity
+    
+    def subscribe(
+        self,
+        callback: Callable[[List[LogEvent]], None],
+        categories: Optional[Iterable[str]] = None,
+        agents: Optional[Iterable[Optional[str]]] = None,
+    ) -> None:
+        """Call callback with each flushed batch of events matching the category/agent filters"""
+        self._subscribers.append((
+            None if categories is None else frozenset(categories),
+            None if agents is None else frozenset(agents),
+            callback,
+        ))
+    
+    def unsubscribe(self, callback: Callable[[List[LogEvent]], None]) -> None:
+        """Stop delivering events to callback"""
+        self._subscribers = [sub for sub in self._subscribers if sub[2] != callback]
+    
     def _get_elapsed_ms(self) -> int:
         """Get milliseconds since simulation start"""
-        if not self.start_time:
+        if self._start_ns is None:
             return 0
-        return int((datetime.now() - self.start_time).total_seconds() * 1000)
+        return (time.perf_counter_ns() - self._start_ns) // 1_000_000
+    
+    def _format_timestamp(self, elapsed_ms: int) -> Optional[str]:
+        """ISO-8601 wall-clock time of an event, from the start time plus its elapsed_ms"""
+        if self._wall_start_ns is None:
+            return None
+        return datetime.fromtimestamp((self._wall_start_ns + elapsed_ms * 1_000_000) / 1e9).isoformat()
+    
+    def _export_row(self, event_id: int, include_timestamp: bool = True) -> Dict:
+        """Event as exported, optionally with its ISO timestamp synthesized; agent_id omitted when None"""
+        strings = self._strings
+        i = event_id - self._offset
+        row = {"id": event_id, "tick": self._tick[i]}
+        if include_timestamp:
+            row["timestamp"] = self._format_timestamp(self._elapsed_ms[i])
+        row["elapsed_ms"] = self._elapsed_ms[i]
+        row["category"] = strings[self._category[i]]
+        row["type"] = strings[self._type[i]]
+        agent_id = strings[self._agent[i]]
+        if agent_id is not None:
+            row["agent_id"] = agent_id
+        row["data"] = self._data[i]
+        return row
     
     def set_tick(self, tick: int):
-        """Update current tick"""
+        """Update current tick; the previous tick's events are flushed as one batch"""
+        self.flush()
         self.current_tick = tick
     
     # Convenience logging methods
@@ -143,89 +464,242 @@ class SimulationLogger:
     # Query methods
     def get_events_by_tick(self, tick: int) -> List[Dict]:
         """Get all events for a specific tick"""
-        return [e for e in self.events if e["tick"] == tick]
+        self.flush()
+        return [self._row(i) for i in self._in_window(self._by_tick.get(tick, []))]
     
     def get_events_by_category(self, category: str) -> List[Dict]:
         """Get all events of a category"""
-        return [e for e in self.events if e["category"] == category]
+        self.flush()
+        return [self._row(i) for i in self._in_window(self._by_category.get(category, []))]
     
     def get_events_by_agent(self, agent_id: str) -> List[Dict]:
         """Get all events for a specific agent"""
-        return [e for e in self.events if e.get("agent_id") == agent_id]
+        self.flush()
+        return [self._row(i) for i in self._in_window(self._by_agent.get(agent_id, []))]
     
     def get_recent_events(self, limit: int = 50) -> List[Dict]:
         """Get most recent events"""
-        return self.events[-limit:]
+        self.flush()
+        return [self._row(i) for i in self._retained_ids()[-limit:]]
     
     def get_timeline(self) -> List[Dict]:
         """Get timeline of events grouped by tick"""
-        timeline = {}
-        for event in self.events:
-            tick = event["tick"]
-            if tick not in timeline:
-                timeline[tick] = []
-            timeline[tick].append(event)
+        self.flush()
+        by_tick = self._by_tick
+        if not by_tick:
+            return []
+        # Ticks are dense small ints, so walk them in order instead of sorting the keys
+        low, high = min(by_tick), max(by_tick)
+        if high - low < 2 * len(by_tick):
+            ticks = range(low, high + 1)
+        else:
+            ticks = sorted(by_tick)
         
-        return [
-            {"tick": tick, "events": events}
-            for tick, events in sorted(timeline.items())
-        ]
+        timeline = []
+        for tick in ticks:
+            ids = by_tick.get(tick)
+            if ids:
+                ids = self._in_window(ids)
+                if ids:
+                    timeline.append({"tick": tick, "events": [self._row(i) for i in ids]})
+        return timeline
     
     def get_summary(self) -> Dict[str, Any]:
         """Get logging summary"""
+        self.flush()
         categories = {}
-        for event in self.events:
-            cat = event["category"]
-            categories[cat] = categories.get(cat, 0) + 1
+        start = self._window_start()
+        for cat, ids in self._by_category.items():
+            count = len(ids) - bisect_left(ids, start)
+            if count:
+                categories[cat] = count
         
         return {
-            "total_events": len(self.events),
+            "total_events": len(self._retained_ids()),
+            "evicted_events": self._window_start(),
             "total_ticks": self.current_tick,
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "elapsed_seconds": self._get_elapsed_ms() / 1000,
             "events_by_category": categories,
         }
     
-    def export_json(self) -> str:
-        """Export all events as JSON"""
-        return json.dumps({
+    def export_json(self, include_timestamps: bool = True) -> str:
+        """Export all events as JSON; ISO timestamps are synthesized unless include_timestamps is False"""
+        self.flush()
+        payload = {
             "summary": self.get_summary(),
-            "events": self.events,
-        }, indent=2, default=str)
+            "events": [self._export_row(i, include_timestamps) for i in self._retained_ids()],
+        }
+        if orjson is not None:
+            return orjson.dumps(
+                payload, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            ).decode()
+        return json.dumps(payload, indent=2, default=str)
+    
+    @staticmethod
+    def _dumps_line(obj: Any) -> bytes:
+        """One compact JSON document plus a trailing newline"""
+        if orjson is not None:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        return json.dumps(obj, default=str, separators=(",", ":")).encode() + b"\n"
+    
+    def export_ndjson(self, fp: BinaryIO, include_timestamps: bool = True) -> None:
+        """
+        Stream the log as newline-delimited JSON to a binary file-like object:
+        the summary on the first line, then one event per line, oldest first
+        """
+        self.flush()
+        fp.write(self._dumps_line(self.get_summary()))
+        for i in self._retained_ids():
+            fp.write(self._dumps_line(self._export_row(i, include_timestamps)))
+    
+    def export_ndjson_bytes(self, include_timestamps: bool = True) -> bytes:
+        """NDJSON export collected into a single bytes object"""
+        buffer = io.BytesIO()
+        self.export_ndjson(buffer, include_timestamps)
+        return buffer.getvalue()
+    
+    def export_msgpack(self) -> bytes:
+        """
+        Binary msgpack archive of the retained log for machine-to-machine transfer.
+        Events carry elapsed_ms only; wall_start_ns lets readers derive timestamps.
+        """
+        if msgpack is None:
+            raise RuntimeError("msgpack export requires the msgpack package")
+        self.flush()
+        return msgpack.packb({
+            "summary": self.get_summary(),
+            "wall_start_ns": self._wall_start_ns,
+            "events": [self._export_row(i, include_timestamp=False) for i in self._retained_ids()],
+        }, use_bin_type=True, default=str)
+    
+    @classmethod
+    def load_msgpack(cls, packed: bytes) -> "SimulationLogger":
+        """Rebuild a logger's columns and indexes from an export_msgpack archive"""
+        if msgpack is None:
+            raise RuntimeError("msgpack import requires the msgpack package")
+        archive = msgpack.unpackb(packed, raw=False, strict_map_key=False)
+        events = archive["events"]
+        return cls._restore(
+            archive["summary"],
+            archive["wall_start_ns"],
+            events[0]["id"] if events else 0,
+            [
+                LogEvent(e["tick"], e["elapsed_ms"], e["category"], e["type"], e.get("agent_id"), e["data"])
+                for e in events
+            ],
+        )
+    
+    @classmethod
+    def _restore(
+        cls,
+        summary: Dict[str, Any],
+        wall_start_ns: Optional[int],
+        first_id: int,
+        events: List[LogEvent],
+    ) -> "SimulationLogger":
+        """New logger holding archived events, replayed through the normal batch flush"""
+        logger = cls(max_events=max(MAX_EVENTS, len(events)))
+        logger.current_tick = summary["total_ticks"]
+        logger._wall_start_ns = wall_start_ns
+        if wall_start_ns is not None:
+            logger.start_time = datetime.fromtimestamp(wall_start_ns / 1e9)
+        # Keep the archived ids; anything before the first one was evicted at export time
+        logger._offset = first_id
+        logger._pending = events
+        logger.flush()
+        return logger
+    
+    def export_compact(self, codec: Optional[str] = "gzip") -> bytes:
+        """
+        Template-compressed archive of the retained log: the data keys of each
+        (category, type) are stored once as a schema, and each event becomes
+        [schema_id, tick, elapsed_ms, agent_id, *values]. Events whose keys differ
+        from their schema fall back to [None, tick, elapsed_ms, agent_id, category, type, data].
+        The JSON document is then compressed with codec (gzip, zstd or None).
+        """
+        self.flush()
+        strings = self._strings
+        schemas: List[List[Any]] = []
+        schema_ids: Dict[Tuple[str, str], Tuple[int, Tuple]] = {}
+        rows = []
+        for event_id in self._retained_ids():
+            i = event_id - self._offset
+            category, event_type = strings[self._category[i]], strings[self._type[i]]
+            data = self._data[i]
+            keys = tuple(data)
+            schema = schema_ids.get((category, event_type))
+            if schema is None:
+                schema = schema_ids[(category, event_type)] = (len(schemas), keys)
+                schemas.append([category, event_type, list(keys)])
+            head = [self._tick[i], self._elapsed_ms[i], strings[self._agent[i]]]
+            if keys == schema[1]:
+                rows.append([schema[0], *head, *data.values()])
+            else:
+                rows.append([None, *head, category, event_type, data])
+        
+        document = {
+            "summary": self.get_summary(),
+            "wall_start_ns": self._wall_start_ns,
+            "first_id": self._window_start(),
+            "schemas": schemas,
+            "events": rows,
+        }
+        if orjson is not None:
+            raw = orjson.dumps(document, default=str, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            raw = json.dumps(document, default=str, separators=(",", ":")).encode()
+        return _compress(raw, codec)
+    
+    @classmethod
+    def load_compact(cls, blob: bytes, codec: Optional[str] = "gzip") -> "SimulationLogger":
+        """Rebuild a logger from an export_compact archive"""
+        raw = _decompress(blob, codec)
+        document = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        schemas = document["schemas"]
+        events = []
+        for row in document["events"]:
+            schema_id, tick, elapsed_ms, agent_id = row[:4]
+            if schema_id is None:
+                category, event_type, data = row[4:]
+            else:
+                category, event_type, keys = schemas[schema_id]
+                data = dict(zip(keys, row[4:]))
+            events.append(LogEvent(tick, elapsed_ms, category, event_type, agent_id, data))
+        return cls._restore(document["summary"], document["wall_start_ns"], document["first_id"], events)
+    
+    def export_compressed(self, path: str, codec: str = "gzip") -> None:
+        """Stream the NDJSON export through gzip (fastest level) or zstd into path"""
+        if codec == "gzip":
+            with gzip.open(path, "wb", compresslevel=1) as fp:
+                self.export_ndjson(fp)
+        elif codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstd export requires the zstandard package")
+            with open(path, "wb") as raw, zstandard.ZstdCompressor(level=3).stream_writer(raw) as fp:
+                self.export_ndjson(fp)
+        else:
+            raise ValueError(f"Unknown compression codec: {codec}")
     
     def generate_replay_script(self) -> List[str]:
         """Generate human-readable replay of key events"""
-        script = []
+        self.flush()
+        strings = self._strings
+        # Only categories with a formatter are visited, merged back into log order
+        ids = heapq.merge(*(
+            self._in_window(self._by_category.get(category, []))
+            for category in _REPLAY_CATEGORIES
+        ))
         
-        for event in self.events:
-            if event["category"] == "simulation":
-                continue
-            
-            timestamp = event["timestamp"].split("T")[1][:8]
-            tick = event["tick"]
-            
-            if event["category"] == "allocation" and event["type"] == "patient_assigned":
-                data = event["data"]
-                script.append(
-                    f"[Tick {tick}] Patient {data['patient_id']} ({data['severity']}) "
-                    f"→ {data['hospital_id']}"
-                )
-            elif event["category"] == "dispatch":
-                data = event["data"]
-                script.append(
-                    f"[Tick {tick}] 🚑 {data['ambulance_id']} dispatched for "
-                    f"{data['patient_id']} (ETA: {data['eta_minutes']}min)"
-                )
-            elif event["category"] == "prevention":
-                data = event["data"]
-                script.append(
-                    f"[Tick {tick}] ⚠️ Overload prevented at {data['hospital_id']}"
-                )
-            elif event["category"] == "supply":
-                data = event["data"]
-                script.append(
-                    f"[Tick {tick}] 📦 {data['quantity']} {data['supply_type']} "
-                    f"→ {data['destination']}"
-                )
+        script = []
+        for event_id in ids:
+            i = event_id - self._offset
+            category = strings[self._category[i]]
+            formatter = (
+                _REPLAY_FORMATTERS.get((category, strings[self._type[i]]))
+                or _REPLAY_FORMATTERS.get((category, None))
+            )
+            if formatter:
+                script.append(formatter(self._tick[i], self._data[i]))
         
         return script